@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import json
+import os
+import stat as stat_module
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import Any, Dict, List, Sequence, Set
+from typing import Any, Dict, List, Sequence, Set, Tuple
 
 try:
     import tomllib  # type: ignore[attr-defined]
@@ -15,55 +17,96 @@ from fastsearch.index.db import DATA_DIR
 
 SETTINGS_PATH = DATA_DIR / "settings.json"
 DEFAULTS_PATH = Path(__file__).with_name("defaults.toml")
-_DEFAULTS_CACHE: Dict[str, Any] | None = None
+# Parsed TOML and fully-resolved helper results, both keyed by the defaults
+# file mtime so edits are picked up without re-parsing on every call.
+_DEFAULTS_CACHE: Tuple[int, Dict[str, Any]] | None = None
+_RESOLVED: Dict[str, Tuple[int, Any]] = {}
+_MISSING_MTIME = -1
+
+
+def _defaults_mtime_ns() -> int:
+    try:
+        return DEFAULTS_PATH.stat().st_mtime_ns
+    except OSError:
+        return _MISSING_MTIME
 
 
 def _load_defaults() -> Dict[str, Any]:
     global _DEFAULTS_CACHE
-    if _DEFAULTS_CACHE is not None:
-        return _DEFAULTS_CACHE
-    if not DEFAULTS_PATH.exists():
-        _DEFAULTS_CACHE = {}
-        return _DEFAULTS_CACHE
+    mtime = _defaults_mtime_ns()
+    if _DEFAULTS_CACHE is not None and _DEFAULTS_CACHE[0] == mtime:
+        return _DEFAULTS_CACHE[1]
+    cfg: Dict[str, Any] = {}
+    if mtime != _MISSING_MTIME:
+        try:
+            with DEFAULTS_PATH.open("rb") as fh:
+                cfg = tomllib.load(fh)
+        except Exception:
+            cfg = {}
+    _DEFAULTS_CACHE = (mtime, cfg)
+    _RESOLVED.clear()
+    return cfg
+
+
+def _is_existing_dir(p: Path) -> bool:
+    # Single stat() instead of the exists()+is_dir() pair (two syscalls).
     try:
-        with DEFAULTS_PATH.open("rb") as fh:
-            _DEFAULTS_CACHE = tomllib.load(fh)
-    except Exception:
-        _DEFAULTS_CACHE = {}
-    return _DEFAULTS_CACHE
+        return stat_module.S_ISDIR(os.stat(p).st_mode)
+    except OSError:
+        return False
 
 
 def _coerce_paths(raw_paths: Sequence[str]) -> List[Path]:
     paths: List[Path] = []
     for raw in raw_paths:
         p = Path(raw).expanduser()
-        if p.exists() and p.is_dir():
+        if _is_existing_dir(p):
             paths.append(p)
     return paths
 
 
 def default_watch_dirs() -> List[Path]:
+    mtime = _defaults_mtime_ns()
+    cached = _RESOLVED.get("watch_dirs")
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
     cfg = _load_defaults()
     raw = cfg.get("watch_dirs", []) or []
-    return _coerce_paths([str(p) for p in raw])
+    paths = _coerce_paths([str(p) for p in raw])
+    _RESOLVED["watch_dirs"] = (mtime, paths)
+    return paths
 
 
 def default_exclude_names(fallback: Sequence[str] | None = None) -> Set[str]:
+    mtime = _defaults_mtime_ns()
+    cached = _RESOLVED.get("exclude_names")
+    if cached is not None and cached[0] == mtime and cached[1]:
+        return cached[1]
     cfg = _load_defaults()
     names = cfg.get("exclude_dir_names")
     if not names:
         fb = fallback or []
         return {name.lower() for name in fb}
-    return {str(name).lower() for name in names}
+    resolved = {str(name).lower() for name in names}
+    _RESOLVED["exclude_names"] = (mtime, resolved)
+    return resolved
 
 
 def default_preview_max_bytes(fallback: int = 2_000_000) -> int:
+    mtime = _defaults_mtime_ns()
+    cached = _RESOLVED.get("preview_max_bytes")
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
     cfg = _load_defaults()
-    value = cfg.get("preview_max_bytes")
     try:
-        return int(value)
+        value = int(cfg.get("preview_max_bytes"))
     except (TypeError, ValueError):
         return fallback
+    _RESOLVED["preview_max_bytes"] = (mtime, value)
+    return value
+
+
+_SETTINGS_CACHE: Tuple[int, "Settings"] | None = None
 
 
 @dataclass
@@ -73,17 +116,30 @@ class Settings:
 
     @classmethod
     def load(cls) -> "Settings":
+        global _SETTINGS_CACHE
+        try:
+            mtime = SETTINGS_PATH.stat().st_mtime_ns
+        except OSError:
+            return cls()
+        if _SETTINGS_CACHE is not None and _SETTINGS_CACHE[0] == mtime:
+            return _SETTINGS_CACHE[1]
         try:
-            if SETTINGS_PATH.exists():
-                data = json.loads(SETTINGS_PATH.read_text("utf-8"))
-                return cls(**data)
+            data = json.loads(SETTINGS_PATH.read_text("utf-8"))
+            settings = cls(**data)
         except Exception:
-            pass
-        return cls()
+            return cls()
+        _SETTINGS_CACHE = (mtime, settings)
+        return settings
+
+    @staticmethod
+    def invalidate() -> None:
+        global _SETTINGS_CACHE
+        _SETTINGS_CACHE = None
 
     def save(self) -> None:
         SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
         SETTINGS_PATH.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        Settings.invalidate()
 
 
 def resolved_watch_dirs_from_settings(settings: Settings) -> List[Path]:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 from fastsearch.config.settings import Settings
 
@@ -10,50 +10,110 @@ TEXT_EXTS = {".txt", ".md", ".py", ".json", ".log", ".csv", ".yaml", ".yml", ".x
 IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".tiff"}
 PDF_EXTS = {".pdf"}
 
+# Optional dependencies resolved once on first use; the repeated
+# `from ... import` in the hot path still pays sys.modules + attribute
+# lookups per call.
+_PdfReader = None
+_pdf_tried = False
+_ocr_modules: tuple | None = None
+_ocr_tried = False
 
-def extract_text_for_index(path: Path, settings: Optional[Settings] = None, max_bytes: int = 2_000_000) -> Optional[str]:
-    ext = path.suffix.lower()
+
+def _pdf_reader_cls():
+    global _PdfReader, _pdf_tried
+    if not _pdf_tried:
+        _pdf_tried = True
+        try:
+            from pypdf import PdfReader as _PdfReader  # type: ignore # noqa: F811
+        except Exception:
+            _PdfReader = None
+    return _PdfReader
+
+
+def _ocr_backend():
+    global _ocr_modules, _ocr_tried
+    if not _ocr_tried:
+        _ocr_tried = True
+        try:
+            import pytesseract  # type: ignore
+            from PIL import Image  # type: ignore
+        except Exception:
+            _ocr_modules = None
+        else:
+            _ocr_modules = (pytesseract, Image)
+    return _ocr_modules
+
+
+def _extract_text(path: Path, settings: Optional[Settings], max_bytes: int) -> Optional[str]:
+    # Read raw bytes and decode once; the io text layer's incremental
+    # decoding is the dominant cost for large .log/.csv/.json files.
+    # Reading one byte past the cap doubles as the size check, so no
+    # separate stat() is needed.
+    with open(path, "rb", buffering=262_144) as f:
+        raw = f.read(max_bytes + 1)
+    if len(raw) > max_bytes:
+        return None
+    return raw.decode("utf-8", errors="replace")
+
+
+def _extract_pdf(path: Path, settings: Optional[Settings], max_bytes: int) -> Optional[str]:
+    PdfReader = _pdf_reader_cls()
+    if PdfReader is None:
+        return None
     try:
-        if ext in TEXT_EXTS:
-            if path.stat().st_size > max_bytes:
-                return None
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                text = f.read()
-                return text
-        if ext in PDF_EXTS:
-            try:
-                from pypdf import PdfReader  # type: ignore
-            except Exception:
-                return None
-            try:
-                reader = PdfReader(str(path), strict=False)
-                parts = []
-                for page in reader.pages:
-                    try:
-                        t = page.extract_text() or ""
-                    except Exception:
-                        t = ""
-                    if t:
-                        parts.append(t)
-                text = "\n".join(parts).strip()
-                return text or None
-            except Exception:
-                return None
-        if ext in IMAGE_EXTS:
-            st = settings or Settings()
-            if not st.enable_ocr:
-                return None
-            try:
-                import pytesseract  # type: ignore
-                from PIL import Image  # type: ignore
-            except Exception:
-                return None
+        # No input-size gate: scanned/image-heavy PDFs are huge on disk but
+        # carry small text layers, and the page loop below already stops
+        # once enough text has accumulated for the index.
+        reader = PdfReader(str(path), strict=False)
+        buf = []
+        total = 0
+        for page in reader.pages:
             try:
-                with Image.open(path) as img:
-                    text = pytesseract.image_to_string(img)
-                return (text or "").strip() or None
+                t = page.extract_text() or ""
             except Exception:
-                return None
+                t = ""
+            if t:
+                buf.append(t)
+                total += len(t)
+                # Stop extracting once we have enough for the index.
+                if total >= max_bytes:
+                    break
+        text = "\n".join(buf).strip()[:max_bytes]
+        return text or None
+    except Exception:
+        return None
+
+
+def _extract_image(path: Path, settings: Optional[Settings], max_bytes: int) -> Optional[str]:
+    st = settings or Settings()
+    if not st.enable_ocr:
+        return None
+    backend = _ocr_backend()
+    if backend is None:
+        return None
+    pytesseract, Image = backend
+    try:
+        with Image.open(path) as img:
+            text = pytesseract.image_to_string(img)
+        return (text or "").strip() or None
+    except Exception:
+        return None
+
+
+# Single jump table: one dict probe per file instead of successive
+# membership tests against each extension set.
+_EXT_HANDLERS: Dict[str, Callable[[Path, Optional[Settings], int], Optional[str]]] = {
+    **{e: _extract_text for e in TEXT_EXTS},
+    **{e: _extract_pdf for e in PDF_EXTS},
+    **{e: _extract_image for e in IMAGE_EXTS},
+}
+
+
+def extract_text_for_index(path: Path, settings: Optional[Settings] = None, max_bytes: int = 2_000_000) -> Optional[str]:
+    handler = _EXT_HANDLERS.get(path.suffix.lower())
+    if handler is None:
+        return None
+    try:
+        return handler(path, settings, max_bytes)
     except Exception:
         return None
-    return None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import os as _os
@@ -10,10 +11,11 @@ from PySide6 import QtWidgets
 
 from fastsearch.index.db import initialize
 from fastsearch.index.docs_repo import DocsRepo
-from fastsearch.service.watcher import WatchService, WatcherConfig, DEFAULT_EXCLUDES
+from fastsearch.service.watcher import WatchService, WatcherConfig, build_excludes
 from fastsearch.service.indexer import ContentIndexer
 from fastsearch.config.settings import (
     Settings,
+    _is_existing_dir,
     default_watch_dirs,
     resolved_watch_dirs_from_settings,
 )
@@ -23,17 +25,45 @@ from .views.main_window import MainWindow
 log = logging.getLogger(__name__)
 
 
+def _filter_existing_dirs(candidates: List[Path]) -> List[Path]:
+    # Drop duplicates before probing: on case-insensitive filesystems
+    # (Windows, default macOS) e.g. Documents/documents would stat the same
+    # directory twice. normcase keeps this syscall-free.
+    seen: set[str] = set()
+    deduped: List[Path] = []
+    for p in candidates:
+        key = os.path.normcase(os.path.normpath(str(p)))
+        if key in seen:
+            continue
+        seen.add(key)
+        deduped.append(p)
+    candidates = deduped
+    # Overlap the stat() latency across candidates; matters on cold caches
+    # and network-mounted homes. Order of survivors is preserved.
+    if len(candidates) <= 1:
+        return [p for p in candidates if _is_existing_dir(p)]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(8, len(candidates))) as pool:
+        flags = list(pool.map(_is_existing_dir, candidates))
+    return [p for p, ok in zip(candidates, flags) if ok]
+
+
+@functools.lru_cache(maxsize=1)
+def _qss_text() -> str:
+    try:
+        return (Path(__file__).parent / "assets" / "qss" / "dark.qss").read_text(encoding="utf-8")
+    except OSError:
+        return ""
+
+
 def _load_env_watch_dirs() -> List[Path]:
-    env = os.environ.get("FASTSEARCH_WATCH_DIRS")
+    env = os.environ.get("FASTSEARCH_WATCH_DIRS", "")
     if not env:
         return []
-    parts = [p.strip() for p in env.split(os.pathsep) if p.strip()]
-    paths: List[Path] = []
-    for p in parts:
-        pp = Path(p)
-        if pp.exists() and pp.is_dir():
-            paths.append(pp)
-    return paths
+    # dict.fromkeys drops duplicate entries while preserving order.
+    parts = dict.fromkeys(p.strip() for p in env.split(os.pathsep) if p.strip())
+    return _filter_existing_dirs([Path(p) for p in parts])
 
 
 def _fallback_watch_dirs() -> List[Path]:
@@ -41,16 +71,12 @@ def _fallback_watch_dirs() -> List[Path]:
         if os.name == "nt":
             system_drive = os.environ.get("SystemDrive", "C:")
             root = Path(system_drive + "\\")
-            if root.exists():
+            if _is_existing_dir(root):
                 return [root]
     except Exception:
         pass
     home = Path.home()
-    candidates = []
-    for name in ("Documents", "Downloads", "Desktop"):
-        p = home / name
-        if p.exists() and p.is_dir():
-            candidates.append(p)
+    candidates = _filter_existing_dirs([home / name for name in ("Documents", "Downloads", "Desktop")])
     if not candidates:
         candidates.append(home)
     return candidates
@@ -85,10 +111,9 @@ def run_gui() -> None:
     app.setApplicationName("FastSearch")
 
     # Apply dark-ish stylesheet
-    qss_path = Path(__file__).parent / "assets" / "qss" / "dark.qss"
-    if qss_path.exists():
-        with open(qss_path, "r", encoding="utf-8") as f:
-            app.setStyleSheet(f.read())
+    qss = _qss_text()
+    if qss:
+        app.setStyleSheet(qss)
 
     repo = DocsRepo()
     settings = Settings.load()
@@ -103,7 +128,7 @@ def run_gui() -> None:
     indexer = ContentIndexer(workers=_workers, settings=settings, roots=watch_dirs)
     log.info(f"Content indexer using {_workers} workers")
     indexer.start()
-    watcher = WatchService(repo, WatcherConfig(roots=watch_dirs, exclude_dir_names={s.lower() for s in DEFAULT_EXCLUDES}), indexer=indexer)
+    watcher = WatchService(repo, WatcherConfig(roots=watch_dirs, exclude_dir_names=set(build_excludes())), indexer=indexer)
 
     win = MainWindow(repo=repo, watch_dirs=watch_dirs, watcher=watcher, settings=settings)
     win.resize(1250, 760)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import List, Sequence
+from typing import Dict, List, Sequence
 
 from PySide6 import QtCore, QtGui, QtWidgets
 from ..style.colors import tinted_background
@@ -11,19 +11,73 @@ from ..style.colors import tinted_background
 class ResultsTableModel(QtCore.QAbstractTableModel):
     HEADERS = ["Name", "Location", "Type", "Size", "Modified"]
 
-    def __init__(self, rows: List[dict] | None = None) -> None:
+    _BRUSH_CACHE: dict[str, QtGui.QBrush] = {}
+
+    def __init__(self, columns: Dict[str, list] | None = None) -> None:
         super().__init__()
-        self._rows: List[dict] = rows or []
+        # Freeze the two standard icons at construction; data() then never
+        # touches QApplication.style() again.
+        style = QtWidgets.QApplication.style()
+        self._file_icon = style.standardIcon(QtWidgets.QStyle.SP_FileIcon)
+        self._dir_icon = style.standardIcon(QtWidgets.QStyle.SP_DirIcon)
+        self._paths: List[str] = []
+        self._display_cols: tuple = ([], [], [], [], [])
+        self._bg: List[QtGui.QBrush] = []
+        self._icons: List[QtGui.QIcon] = []
+        self._tooltips: List[str | None] = []
+        self._filetypes: List[str | None] = []
+        if columns:
+            self.set_columns(columns)
 
-    def set_rows(self, rows: List[dict]) -> None:
+    def set_columns(self, cols: Dict[str, list]) -> None:
+        # Results arrive as a struct-of-arrays dict (one list per column);
+        # Qt calls data() once per (row, column, role), so formatting here
+        # keeps each of those calls a plain list lookup.
+        paths = cols.get("path") or []
+        n = len(paths)
+        names = cols.get("name") or [None] * n
+        locs = cols.get("location_path") or [""] * n
+        exts = cols.get("ext") or [""] * n
+        sizes = cols.get("size_bytes") or [0] * n
+        mtimes = cols.get("mtime_ns") or [0] * n
+        raw_filetypes = cols.get("filetype") or [None] * n
+        # One typed list per display column (SoA) so data() indexes straight
+        # into the column for the requested cell.
+        type_col: List[str] = []
+        size_col: List[str] = []
+        mtime_col: List[str] = []
+        bg: List[QtGui.QBrush] = []
+        icons: List[QtGui.QIcon] = []
+        brush_cache = self._BRUSH_CACHE
+        icon_cache: dict[str, QtGui.QIcon] = {}
+        for raw_ext, size, mtime_ns, raw_ft in zip(exts, sizes, mtimes, raw_filetypes):
+            ft = raw_ft or ""
+            ext = (raw_ext or "").lstrip(".")
+            type_col.append(ext.upper() if ext else ft)
+            size_col.append(self._format_size(size or 0))
+            mtime_col.append(datetime.fromtimestamp((mtime_ns or 0) / 1e9).strftime("%Y-%m-%d %H:%M"))
+            brush = brush_cache.get(ft)
+            if brush is None:
+                brush = brush_cache[ft] = tinted_background(ft, alpha=24)
+            bg.append(brush)
+            ft_lower = ft.lower()
+            icon = icon_cache.get(ft_lower)
+            if icon is None:
+                icon = icon_cache[ft_lower] = self._icon_for_type(ft_lower)
+            icons.append(icon)
         self.beginResetModel()
-        self._rows = rows
+        self._paths = list(paths)
+        self._display_cols = (list(names), list(locs), type_col, size_col, mtime_col)
+        self._bg = bg
+        self._icons = icons
+        self._tooltips = list(paths)
+        self._filetypes = list(raw_filetypes)
         self.endResetModel()
 
     def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # type: ignore[override]
         if parent.isValid():
             return 0
-        return len(self._rows)
+        return len(self._paths)
 
     def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # type: ignore[override]
         return len(self.HEADERS)
@@ -31,36 +85,20 @@ class ResultsTableModel(QtCore.QAbstractTableModel):
     def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):  # type: ignore[override]
         if not index.isValid():
             return None
-        row = self._rows[index.row()]
+        i = index.row()
         col = index.column()
         if role == QtCore.Qt.DisplayRole:
-            if col == 0:
-                return row.get("name")
-            if col == 1:
-                return row.get("location_path", "")
-            if col == 2:
-                ext = (row.get("ext") or "").lstrip(".")
-                if ext:
-                    return ext.upper()
-                return row.get("filetype")
-            if col == 3:
-                return self._format_size(row.get("size_bytes", 0))
-            if col == 4:
-                ts = row.get("mtime_ns", 0) / 1e9
-                return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+            return self._display_cols[col][i]
         if role == QtCore.Qt.BackgroundRole:
-            ft = (row.get("filetype") or "")
-            return tinted_background(ft, alpha=24)
+            return self._bg[i]
         if role == QtCore.Qt.UserRole + 1:
             if col == 2:
-                return row.get("filetype")
+                return self._filetypes[i]
         if role == QtCore.Qt.DecorationRole:
             if col == 0:
-                # Choose icon by filetype (simple mapping)
-                ft = (row.get("filetype") or "").lower()
-                return self._icon_for_type(ft)
+                return self._icons[i]
         if role == QtCore.Qt.ToolTipRole:
-            return row.get("path")
+            return self._tooltips[i]
         return None
 
     def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole):  # type: ignore[override]
@@ -69,30 +107,15 @@ class ResultsTableModel(QtCore.QAbstractTableModel):
         return None
 
     def row_path(self, row: int) -> str:
-        return self._rows[row].get("path", "")
+        return self._paths[row] or ""
+
+    _SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
 
     @staticmethod
     def _format_size(size: int) -> str:
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if size < 1024.0:
-                return f"{size:.0f} {unit}"
-            size /= 1024.0
-        return f"{size:.0f} PB"
+        # bit_length picks the unit in O(1) instead of dividing up to 5 times.
+        i = 0 if size <= 0 else min(5, (size.bit_length() - 1) // 10)
+        return f"{size / (1 << (10 * i)):.0f} {ResultsTableModel._SIZE_UNITS[i]}"
 
-    @staticmethod
-    def _icon_for_type(ft: str):
-        # Simple icon mapping using standard icons
-        style = QtWidgets.QApplication.style()
-        if "image" in ft:
-            return style.standardIcon(QtWidgets.QStyle.SP_FileIcon)
-        if "pdf" in ft:
-            return style.standardIcon(QtWidgets.QStyle.SP_FileIcon)
-        if "code" in ft:
-            return style.standardIcon(QtWidgets.QStyle.SP_FileIcon)
-        if "spreadsheet" in ft:
-            return style.standardIcon(QtWidgets.QStyle.SP_FileIcon)
-        if "presentation" in ft:
-            return style.standardIcon(QtWidgets.QStyle.SP_FileIcon)
-        if "archive" in ft:
-            return style.standardIcon(QtWidgets.QStyle.SP_DirIcon)
-        return style.standardIcon(QtWidgets.QStyle.SP_FileIcon)
+    def _icon_for_type(self, ft: str) -> QtGui.QIcon:
+        return self._dir_icon if ft == "archive" else self._file_icon
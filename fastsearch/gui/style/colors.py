@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+
 from PySide6 import QtGui
 
 
@@ -16,7 +18,10 @@ FILETYPE_COLORS: dict[str, str] = {
 }
 
 
+@functools.lru_cache(maxsize=128)
 def color_for_filetype(ft: str) -> QtGui.QColor:
+    # Callers must treat the returned QColor as immutable (copy before
+    # mutating, as tinted_background does).
     hex_color = FILETYPE_COLORS.get(ft, FILETYPE_COLORS["Other"])
     return QtGui.QColor(hex_color)
 
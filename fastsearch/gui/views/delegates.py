@@ -2,7 +2,15 @@ from __future__ import annotations
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
-from ..style.colors import color_for_filetype
+from ..style.colors import FILETYPE_COLORS, color_for_filetype
+
+
+# Brushes frozen at import: paint() indexes instead of allocating a
+# transient QColor/QBrush pair per cell repaint.
+_BRUSH_BY_FT = {ft: QtGui.QBrush(color_for_filetype(ft)) for ft in FILETYPE_COLORS}
+_DEFAULT_BRUSH = _BRUSH_BY_FT["Other"]
+
+_WHITE_PEN = QtGui.QPen(QtGui.QColor("#ffffff"))
 
 
 class PillDelegate(QtWidgets.QStyledItemDelegate):
@@ -11,7 +19,7 @@ class PillDelegate(QtWidgets.QStyledItemDelegate):
     def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> None:  # type: ignore[override]
         text = str(index.data(QtCore.Qt.DisplayRole) or "")
         ft = index.data(QtCore.Qt.UserRole + 1) or text
-        color = color_for_filetype(ft)
+        brush = _BRUSH_BY_FT.get(ft, _DEFAULT_BRUSH)
         # Base style painting (for selection highlighting background)
         opt = QtWidgets.QStyleOptionViewItem(option)
         self.initStyleOption(opt, index)
@@ -29,11 +37,10 @@ class PillDelegate(QtWidgets.QStyledItemDelegate):
 
         painter.save()
         painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
-        painter.fillPath(path, color)
+        painter.fillPath(path, brush)
 
         # Text
-        pen = QtGui.QPen(QtGui.QColor("#ffffff"))
-        painter.setPen(pen)
+        painter.setPen(_WHITE_PEN)
         font = painter.font()
         font.setBold(True)
         painter.setFont(font)
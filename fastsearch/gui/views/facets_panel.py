@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+import functools
+from typing import Dict, List, Set, Tuple
 
 from PySide6 import QtCore, QtWidgets
 
 from ..models.facets_model import FacetCounts, FacetSelection
+from ..style.colors import FILETYPE_COLORS
 
 
 class _FacetGroup(QtWidgets.QGroupBox):
@@ -13,38 +15,81 @@ class _FacetGroup(QtWidgets.QGroupBox):
     def __init__(self, title: str, kind: str | None = None) -> None:
         super().__init__(title)
         self.setLayout(QtWidgets.QVBoxLayout())
+        self.layout().addStretch(1)
         self._checks: Dict[str, QtWidgets.QCheckBox] = {}
+        self._order: List[str] = []
+        self._selected: Set[str] = set()
+        self._counts: Dict[str, int] = {}
         self._kind = kind  # e.g., 'filetype', 'size', etc.
 
     def set_items(self, items: Dict[str, int], selected: List[str]) -> None:
-        # Clear
+        # Diff-update: keep existing checkboxes and only relabel/recheck them;
+        # destroying and reallocating widgets per count refresh causes visible
+        # stalls when a facet (e.g. Location) has many entries.
         layout = self.layout()
-        while layout.count():
-            w = layout.takeAt(0).widget()
-            if w:
-                w.deleteLater()
-        self._checks.clear()
-        # Add sorted by name
-        from ..style.colors import FILETYPE_COLORS
-        for key, count in sorted(items.items(), key=lambda kv: kv[0].lower()):
+        for key in set(self._checks) - set(items):
+            cb = self._checks.pop(key)
+            self._selected.discard(key)
+            layout.removeWidget(cb)
+            cb.deleteLater()
+        other_color = FILETYPE_COLORS.get("Other", "#9aa0a6")
+        # Schwartzian transform: casefold each key once instead of per compare.
+        sorted_items = [(k, v) for _, k, v in sorted((k.casefold(), k, v) for k, v in items.items())]
+        for key, count in sorted_items:
+            # Touch only dirty widgets: successive queries usually overlap
+            # heavily, so most counts and check states carry over unchanged.
+            existing = self._checks.get(key)
+            if (
+                existing is not None
+                and self._counts.get(key) == count
+                and (key in selected) == (key in self._selected)
+            ):
+                continue
             label_txt = key if key else "(Unknown)"
             if self._kind == "filetype":
-                hex_color = FILETYPE_COLORS.get(label_txt, FILETYPE_COLORS.get("Other", "#9aa0a6"))
+                hex_color = FILETYPE_COLORS.get(label_txt, other_color)
                 dot = f"<span style='color:{hex_color}; font-size:14px;'>●</span> "
                 label = f"<html>{dot}{QtCore.QCoreApplication.translate('', label_txt)} <span style='color:#9aa0a6'>({count})</span></html>"
             else:
                 label = f"{label_txt} ({count})"
-            cb = QtWidgets.QCheckBox()
+            cb = self._checks.get(key)
+            if cb is None:
+                cb = QtWidgets.QCheckBox()
+                cb.setProperty("facet_key", key)
+                cb.stateChanged.connect(functools.partial(self._on_state_changed, key))
+                self._checks[key] = cb
+            checked = key in selected
+            blocker = QtCore.QSignalBlocker(cb)
             cb.setText(label)
-            cb.setProperty("facet_key", key)
-            cb.setChecked(key in selected)
-            cb.stateChanged.connect(self.selectionChanged.emit)
-            layout.addWidget(cb)
-            self._checks[key] = cb
-        layout.addStretch(1)
+            cb.setChecked(checked)
+            del blocker
+            # Signals were blocked, so mirror the state into the cached set.
+            if checked:
+                self._selected.add(key)
+            else:
+                self._selected.discard(key)
+        self._counts = dict(items)
+        # Re-sort widgets only when the display order actually changed; the
+        # stretch added in __init__ stays last because we insert before it.
+        new_order = [key for key, _ in sorted_items]
+        if new_order != self._order:
+            for key in new_order:
+                layout.removeWidget(self._checks[key])
+            for pos, key in enumerate(new_order):
+                layout.insertWidget(pos, self._checks[key])
+            self._order = new_order
+
+    def _on_state_changed(self, key: str, state: int) -> None:
+        if state:
+            self._selected.add(key)
+        else:
+            self._selected.discard(key)
+        self.selectionChanged.emit()
 
     def selected(self) -> List[str]:
-        return [k for k, cb in self._checks.items() if cb.isChecked()]
+        # Maintained incrementally from stateChanged, so no walk over every
+        # checkbox per selection query.
+        return sorted(self._selected)
 
 
 class FacetsPanel(QtWidgets.QScrollArea):
@@ -69,16 +114,26 @@ class FacetsPanel(QtWidgets.QScrollArea):
         self._layout.addStretch(1)
 
     def update_counts(self, counts: FacetCounts, selection: FacetSelection) -> None:
+        # Block the per-group signals while all four groups refresh so one
+        # counts update cannot cascade into a storm of filtersChanged emits.
+        groups = (self.group_type, self.group_size, self.group_date, self.group_location)
+        blockers = [QtCore.QSignalBlocker(g) for g in groups]
         self.group_type.set_items(counts.filetype, selection.filetype)
         self.group_size.set_items(counts.size_bucket, selection.size_bucket)
         self.group_date.set_items(counts.date_bucket, selection.date_bucket)
         self.group_location.set_items(counts.location, selection.location)
+        del blockers
+        sel = self._selection()
+        if sel != selection:
+            self.filtersChanged.emit(sel)
 
-    def _emit(self) -> None:
-        sel = FacetSelection(
+    def _selection(self) -> FacetSelection:
+        return FacetSelection(
             filetype=self.group_type.selected(),
             size_bucket=self.group_size.selected(),
             date_bucket=self.group_date.selected(),
             location=self.group_location.selected(),
         )
-        self.filtersChanged.emit(sel)
+
+    def _emit(self) -> None:
+        self.filtersChanged.emit(self._selection())
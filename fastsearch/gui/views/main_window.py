@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import array
 import logging
-import threading
+import sqlite3
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -9,6 +10,7 @@ from typing import Dict, List, Optional
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from fastsearch.index.docs_repo import DocsRepo, SearchFilters
+from fastsearch.index.fts import build_match_query
 from .results_view import ResultsView
 from .facets_panel import FacetsPanel
 from .preview_pane import PreviewPane
@@ -27,40 +29,103 @@ log = logging.getLogger(__name__)
 
 
 class SearchWorker(QtCore.QObject):
-    resultsReady = QtCore.Signal(list, dict)  # rows, facets
+    resultsReady = QtCore.Signal(dict, dict)  # columns, facets
     errorOccurred = QtCore.Signal(str)
 
+    RESULT_LIMIT = 500
+
     def __init__(self, repo: DocsRepo) -> None:
         super().__init__()
         self.repo = repo
-        self._lock = threading.Lock()
+        # Single writer (UI thread via notify_seq), single reader (worker
+        # thread); int attribute loads/stores are atomic under the GIL, so
+        # no lock is needed.
         self._latest_seq = 0
+        # Prefix-refinement cache: ids from the last complete result so
+        # typing an extension of the previous query narrows within them.
+        self._last_text: str | None = None
+        self._last_key: tuple | None = None
+        self._last_ids: array.array | None = None
+
+    def notify_seq(self, seq: int) -> None:
+        # Called from the UI thread when a new search is queued so in-flight
+        # queries on the worker thread can detect they are stale. Sequence
+        # numbers are produced monotonically by that single caller.
+        self._latest_seq = seq
+
+    def _is_stale(self, seq: int) -> bool:
+        return seq != self._latest_seq
 
     @QtCore.Slot(int, str, str, object)
     def run_search(self, seq: int, text: str, mode: str, sel_obj: object) -> None:
         sel: FacetSelection = sel_obj  # type: ignore[assignment]
-        with self._lock:
-            self._latest_seq = max(self._latest_seq, seq)
-            current = self._latest_seq
+        # Queued keystrokes that were superseded short-circuit before any
+        # SQLite work; the freshest one also installs a progress handler so
+        # it can be aborted mid-query if another arrives while it runs.
+        if self._is_stale(seq):
+            return
         try:
             loc_ids = self.repo.location_ids_for_paths(sel.location)
+            if self._is_stale(seq):
+                return
             filters = SearchFilters(
                 filetypes=sel.filetype or None,
                 size_buckets=sel.size_bucket or None,
                 date_buckets=sel.date_bucket or None,
                 location_ids=loc_ids or None,
             )
-            rows, facets = self.repo.search(text, filters, mode=mode)
-            out_rows = []
-            for r in rows:
-                d = dict(r)
-                d.setdefault("location_path", "")
-                out_rows.append(d)
-            if seq == current:
-                self.resultsReady.emit(out_rows, facets)
+            # Qt queued-signal delivery does not coalesce, so bursts of
+            # keystroke + facet toggles stack invocations; catch anything
+            # that arrived while location ids were resolving.
+            if self._is_stale(seq):
+                return
+            # Whether this query activates the FTS content branch is part of
+            # the key: build_match_query drops sub-2-char tokens, so "z" →
+            # "ze" switches the branch on, and ids cached from the
+            # name-only search would silently miss content matches.
+            content_active = bool(text) and mode in ("content", "all") and bool(build_match_query(text))
+            key = (mode, content_active, tuple(sel.filetype), tuple(sel.size_bucket), tuple(sel.date_bucket), tuple(sel.location))
+            within_ids = None
+            if (
+                self._last_ids is not None
+                and text
+                and self._last_text
+                and text.startswith(self._last_text)
+                and key == self._last_key
+            ):
+                within_ids = self._last_ids
+            # Columnar fetch: the repo returns one list per column (plain
+            # tuples internally, no sqlite3.Row per result row).
+            cols, facets = self.repo.search(
+                text,
+                filters,
+                limit=self.RESULT_LIMIT,
+                mode=mode,
+                cancel_check=lambda: self._is_stale(seq),
+                within_ids=within_ids,
+                as_columns=True,
+            )
+            ids = cols.get("id") or []
+            # Cache ids only for complete (non-truncated) results; a capped
+            # result set is not a safe superset for refinement.
+            if text and len(ids) < self.RESULT_LIMIT:
+                self._last_text = text
+                self._last_key = key
+                self._last_ids = array.array("q", (int(i) for i in ids))
+            else:
+                self._last_text = None
+                self._last_key = None
+                self._last_ids = None
+            if not self._is_stale(seq):
+                self.resultsReady.emit(cols, facets)
+        except sqlite3.OperationalError:
+            if self._is_stale(seq):
+                return  # aborted by the progress handler; a newer query follows
+            log.exception("Search failed")
+            self.errorOccurred.emit("Search failed: database error")
         except Exception as exc:
             log.exception("Search failed")
-            if seq == current:
+            if not self._is_stale(seq):
                 self.errorOccurred.emit(f"Search failed: {exc}")
 
 
@@ -78,6 +143,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self._seq = 0
         self._state = SearchState()
+        self._last_was_empty = False
 
         # Toolbar: search field + actions
         toolbar = QtWidgets.QToolBar()
@@ -157,12 +223,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self._seq += 1
         text = self.search_edit.text()
         sel = self._state.facets
+        # Mark older in-flight queries stale before queueing the new one
+        self._worker.notify_seq(self._seq)
         # Dispatch to worker via signal
         self.searchRequested.emit(self._seq, text, 'all', sel)
 
-    @QtCore.Slot(list, dict)
-    def _apply_results(self, rows: List[dict], facets: Dict[str, Dict[str, int]]) -> None:
-        self.results.set_rows(rows)
+    @QtCore.Slot(dict, dict)
+    def _apply_results(self, cols: Dict[str, list], facets: Dict[str, Dict[str, int]]) -> None:
+        empty = not cols.get("path")
+        if empty and self._last_was_empty:
+            # Common while typing past the last match: nothing to reset.
+            self._status_label.setText("0 results")
+            return
+        self._last_was_empty = empty
+        self.results.set_columns(cols)
         counts = FacetCounts(
             filetype=facets.get("filetype", {}),
             size_bucket=facets.get("size_bucket", {}),
@@ -170,7 +244,7 @@ class MainWindow(QtWidgets.QMainWindow):
             location=facets.get("location", {}),
         )
         self.facets_panel.update_counts(counts, self._state.facets)
-        self._status_label.setText(f"{len(rows)} results")
+        self._status_label.setText(f"{len(cols.get('path', ()))} results")
 
     @QtCore.Slot(str)
     def _on_search_error(self, message: str) -> None:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import mmap
 import os
 from pathlib import Path
 
@@ -9,6 +10,25 @@ from fastsearch.config.settings import Settings
 from ..style.colors import color_for_filetype
 
 
+_TEXT_EXTS = frozenset({".txt", ".md", ".py", ".json", ".log", ".csv", ".yaml", ".yml"})
+_IMG_EXTS = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".tiff"})
+
+try:
+    import pytesseract  # type: ignore
+except Exception:  # pragma: no cover
+    pytesseract = None
+try:
+    from PIL import Image  # type: ignore
+except Exception:  # pragma: no cover
+    Image = None
+
+# Bounded pool shared by all preview work (head reads and tesseract runs):
+# rapid selection changes queue at most two concurrent jobs instead of a
+# thread per preview.
+_OCR_POOL = QtCore.QThreadPool()
+_OCR_POOL.setMaxThreadCount(2)
+
+
 class PreviewPane(QtWidgets.QWidget):
     def __init__(self, preview_max_bytes: int = 2_000_000, settings: Settings | None = None) -> None:
         super().__init__()
@@ -40,6 +60,7 @@ class PreviewPane(QtWidgets.QWidget):
         self.btn_reveal.clicked.connect(self._reveal)
 
         self._path: str | None = None
+        self._ocr_token = 0
 
     def set_path(self, path: str | None) -> None:
         self._path = path
@@ -50,69 +71,120 @@ class PreviewPane(QtWidgets.QWidget):
             return
         p = Path(path)
         self.title.setText(p.name)
-        try:
-            st = p.stat()
-            ft = classify_filetype(p.suffix)
-            ext = p.suffix.lstrip('.').upper()
-            details = (
-                f"{p}\nType: {ext} {ft}\n"
-                f"Size: {st.st_size:,} bytes\n"
-                f"Modified: {QtCore.QDateTime.fromSecsSinceEpoch(int(st.st_mtime)).toString()}"
-            )
-            self.info.setText(details)
-        except Exception as e:
-            self.info.setText(str(p))
 
-        # Color accent by file type
+        # Color accent by file type (cheap; no filesystem access)
         ft = classify_filetype(p.suffix)
         c = color_for_filetype(ft)
         text_color = "#ffffff"
         self.title.setStyleSheet(f"font-weight:bold; font-size:12pt; padding:8px; border-radius:6px; background:{c.name()}; color:{text_color};")
 
-        # Try to preview text files (small)
-        if p.suffix.lower() in (".txt", ".md", ".py", ".json", ".log", ".csv", ".yaml", ".yml"):
+        # The stat and head read can stall on network drives, so run them off
+        # the UI thread (same pattern as _run_ocr) and apply on completion.
+        self._load_preview(p, ft)
+
+    def _load_preview(self, p: Path, ft: str) -> None:
+        target_path = str(p)
+        max_bytes = self.preview_max_bytes
+        ocr_wanted = self.settings.enable_ocr
+
+        def work() -> None:
+            head = ""
+            kind = "none"
             try:
-                if p.stat().st_size <= self.preview_max_bytes:
-                    with open(p, "r", encoding="utf-8", errors="replace") as f:
-                        head = f.read(64_000)
-                        self.text.setPlainText(head)
-                        return
+                st = p.stat()
+                ext = p.suffix.lstrip('.').upper()
+                details = (
+                    f"{p}\nType: {ext} {ft}\n"
+                    f"Size: {st.st_size:,} bytes\n"
+                    f"Modified: {QtCore.QDateTime.fromSecsSinceEpoch(int(st.st_mtime)).toString()}"
+                )
+                suffix = p.suffix.lower()
+                if suffix in _TEXT_EXTS and st.st_size <= max_bytes:
+                    try:
+                        with open(p, "rb") as f:
+                            if st.st_size <= 4096:
+                                # mmap setup isn't worth it for tiny files
+                                raw = f.read(64_000)
+                            else:
+                                mm = mmap.mmap(f.fileno(), min(64_000, st.st_size), access=mmap.ACCESS_READ)
+                                try:
+                                    raw = mm[:]
+                                finally:
+                                    mm.close()
+                        head = raw.decode("utf-8", "replace")
+                        kind = "text"
+                    except Exception:
+                        pass
+                if kind == "none" and ocr_wanted and suffix in _IMG_EXTS:
+                    kind = "ocr"
             except Exception:
-                pass
-        # If OCR enabled and image file, attempt OCR in background
-        if self.settings.enable_ocr and p.suffix.lower() in (".png", ".jpg", ".jpeg", ".bmp", ".tiff"):
-            self.text.setPlainText("Running OCR…")
-            self._run_ocr(p)
+                details = str(p)
+
+            # Queued invokeMethod posts to the UI thread's event loop; a
+            # QTimer started from a worker thread would never fire (same
+            # delivery as _apply_ocr_text).
+            QtCore.QMetaObject.invokeMethod(
+                self,
+                "_apply_preview",
+                QtCore.Qt.QueuedConnection,
+                QtCore.Q_ARG(str, details),
+                QtCore.Q_ARG(str, head),
+                QtCore.Q_ARG(str, kind),
+                QtCore.Q_ARG(str, target_path),
+            )
+
+        _OCR_POOL.start(work)
+
+    @QtCore.Slot(str, str, str, str)
+    def _apply_preview(self, details: str, head: str, kind: str, target_path: str) -> None:
+        # Discard results from superseded previews.
+        if self._path != target_path:
             return
-        self.text.setPlainText("(No preview available)")
+        self.info.setText(details)
+        if kind == "text":
+            self.text.setPlainText(head)
+        elif kind == "ocr":
+            self.text.setPlainText("Running OCR…")
+            self._run_ocr(Path(target_path))
+        else:
+            self.text.setPlainText("(No preview available)")
 
     def _run_ocr(self, path: Path) -> None:
-        def work() -> str:
-            try:
-                try:
-                    import pytesseract  # type: ignore
-                except Exception:
-                    return "OCR unavailable: install pytesseract and Tesseract OCR."
-                try:
-                    from PIL import Image  # type: ignore
-                except Exception:
-                    return "OCR unavailable: install Pillow."
-                with Image.open(path) as img:
-                    text = pytesseract.image_to_string(img)
-                return text.strip() or "(No text detected)"
-            except Exception as e:
-                return f"OCR failed: {e}"
-
-        import threading
+        self._ocr_token += 1
+        token = self._ocr_token
         target_path = str(path)
 
-        def done(result: str) -> None:
-            def apply() -> None:
-                if self._path == target_path:
-                    self.text.setPlainText(result)
-            QtCore.QTimer.singleShot(0, apply)
+        def work() -> None:
+            if pytesseract is None:
+                result = "OCR unavailable: install pytesseract and Tesseract OCR."
+            elif Image is None:
+                result = "OCR unavailable: install Pillow."
+            else:
+                try:
+                    with Image.open(path) as img:
+                        text = pytesseract.image_to_string(img)
+                    result = text.strip() or "(No text detected)"
+                except Exception as e:
+                    result = f"OCR failed: {e}"
+
+            # Queued invokeMethod posts straight to the UI thread without
+            # allocating a single-shot QTimer per completion.
+            QtCore.QMetaObject.invokeMethod(
+                self,
+                "_apply_ocr_text",
+                QtCore.Qt.QueuedConnection,
+                QtCore.Q_ARG(str, result),
+                QtCore.Q_ARG(str, target_path),
+                QtCore.Q_ARG(int, token),
+            )
+
+        _OCR_POOL.start(work)
 
-        threading.Thread(target=lambda: done(work()), daemon=True).start()
+    @QtCore.Slot(str, str, int)
+    def _apply_ocr_text(self, result: str, target_path: str, token: int) -> None:
+        # Discard results from superseded previews.
+        if self._path == target_path and self._ocr_token == token:
+            self.text.setPlainText(result)
 
     def _open(self) -> None:
         if not self._path:
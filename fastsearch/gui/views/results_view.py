@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
@@ -28,10 +27,10 @@ class ResultsView(QtWidgets.QTableView):
         self.horizontalHeader().setSectionResizeMode(4, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
         self.doubleClicked.connect(self._on_double_clicked)
 
-    def set_rows(self, rows: List[dict]) -> None:
+    def set_columns(self, cols: dict) -> None:
         model: ResultsTableModel = self.model()  # type: ignore[assignment]
-        model.set_rows(rows)
-        if rows:
+        model.set_columns(cols)
+        if cols.get("path"):
             self.selectRow(0)
 
     def current_path(self) -> str | None:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import shutil
 import sqlite3
+import threading
 from pathlib import Path
 
 try:
@@ -39,45 +40,142 @@ def _migrate_legacy_data_dir() -> None:
     shutil.rmtree(LEGACY_DATA_DIR, ignore_errors=True)
 
 
+# PRAGMAs tuned for desktop app speed; one executescript beats six
+# separate parse/prepare round-trips per connection. page_size only takes
+# effect on databases created by this connection; harmless otherwise.
+_PRAGMA_SCRIPT = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+PRAGMA page_size=4096;
+PRAGMA foreign_keys=1;
+"""
+
+
 def connect(db_path: Path | str = DB_PATH) -> sqlite3.Connection:
     ensure_data_dir()
-    con = sqlite3.connect(str(db_path))
+    # Connections live for the thread's lifetime (get_connection), so a
+    # larger statement cache keeps the parsed VDBE programs for the search
+    # and facet SQL variants warm across keystrokes.
+    con = sqlite3.connect(str(db_path), cached_statements=256)
     con.row_factory = sqlite3.Row
-    # PRAGMAs tuned for desktop app speed
-    pragmas = [
-        ("journal_mode", "WAL"),
-        ("synchronous", "NORMAL"),
-        ("temp_store", "MEMORY"),
-        ("mmap_size", 268435456),
-        ("page_size", 4096),
-        ("foreign_keys", 1),
-    ]
-    cur = con.cursor()
-    for key, value in pragmas:
-        cur.execute(f"PRAGMA {key}={value}")
-    cur.close()
+    con.executescript(_PRAGMA_SCRIPT)
+    return con
+
+
+# The FTS5 trigram tokenizer (substring-indexed filename search) shipped
+# in SQLite 3.34; older builds fall back to LIKE scans.
+HAS_TRIGRAM = sqlite3.sqlite_version_info >= (3, 34)
+
+_tls = threading.local()
+
+
+def get_connection(db_path: Path | str = DB_PATH) -> sqlite3.Connection:
+    """Return a per-thread pooled connection for *db_path*.
+
+    Re-opening the database per call re-runs the PRAGMAs (the 256 MB
+    mmap_size remap in particular) and throws away sqlite's statement
+    cache; sqlite3 connections are also thread-affine, so pooling per
+    thread keeps both performance and correctness. Pooled connections
+    stay open for the thread's lifetime — callers must not close them.
+    """
+    cons = getattr(_tls, "cons", None)
+    if cons is None:
+        cons = _tls.cons = {}
+    key = str(db_path)
+    con = cons.get(key)
+    if con is None:
+        con = cons[key] = connect(db_path)
     return con
 
 
 def initialize(db_path: Path | str = DB_PATH) -> None:
     ensure_data_dir()
     schema_path = Path(__file__).with_name("schema.sql")
-    with connect(db_path) as con:
+    with get_connection(db_path) as con:
         with open(schema_path, "r", encoding="utf-8") as f:
             con.executescript(f.read())
         _migrate(con)
 
 
+_LOCATION_COLUMN_ADDS = [
+    ("initial_scan_complete", "ALTER TABLE locations ADD COLUMN initial_scan_complete INTEGER NOT NULL DEFAULT 0"),
+    ("last_scan_ts", "ALTER TABLE locations ADD COLUMN last_scan_ts INTEGER NOT NULL DEFAULT 0"),
+    ("last_scan_count", "ALTER TABLE locations ADD COLUMN last_scan_count INTEGER NOT NULL DEFAULT 0"),
+]
+
+_DOC_COLUMN_ADDS = [
+    ("last_indexed_mtime_ns", "ALTER TABLE docs ADD COLUMN last_indexed_mtime_ns INTEGER"),
+]
+
+
 def _migrate(con: sqlite3.Connection) -> None:
-    # Add columns to locations for scan state if missing
-    cur = con.execute("PRAGMA table_info(locations)")
-    cols = {row[1] for row in cur.fetchall()}  # name is at index 1
-    to_add = []
-    if "initial_scan_complete" not in cols:
-        to_add.append("ALTER TABLE locations ADD COLUMN initial_scan_complete INTEGER NOT NULL DEFAULT 0")
-    if "last_scan_ts" not in cols:
-        to_add.append("ALTER TABLE locations ADD COLUMN last_scan_ts INTEGER NOT NULL DEFAULT 0")
-    if "last_scan_count" not in cols:
-        to_add.append("ALTER TABLE locations ADD COLUMN last_scan_count INTEGER NOT NULL DEFAULT 0")
-    for stmt in to_add:
-        con.execute(stmt)
+    # Add columns to locations for scan state if missing. One sqlite_master
+    # lookup replaces the table_info PRAGMA round trip, and any missing
+    # ALTERs run as a single script in one transaction.
+    row = con.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='locations'"
+    ).fetchone()
+    ddl = (row[0] if row else None) or ""
+    missing = [stmt for col, stmt in _LOCATION_COLUMN_ADDS if col not in ddl]
+    row = con.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='docs'"
+    ).fetchone()
+    docs_ddl = (row[0] if row else None) or ""
+    missing += [stmt for col, stmt in _DOC_COLUMN_ADDS if col not in docs_ddl]
+    if missing:
+        with con:
+            con.executescript(";\n".join(missing))
+    _migrate_fts(con)
+    _migrate_trigram(con)
+
+
+def _migrate_trigram(con: sqlite3.Connection) -> None:
+    # Substring search over file paths: a trigram FTS index turns the
+    # leading-wildcard LIKE scan into an index lookup. Created here rather
+    # than schema.sql so pre-3.34 builds still initialize cleanly.
+    if not HAS_TRIGRAM:
+        return
+    row = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='name_trigram'"
+    ).fetchone()
+    if row:
+        return
+    with con:
+        con.execute(
+            "CREATE VIRTUAL TABLE name_trigram USING fts5(path_norm, tokenize='trigram')"
+        )
+        con.execute(
+            "INSERT INTO name_trigram(rowid, path_norm) SELECT id, LOWER(path) FROM docs"
+        )
+
+
+def _migrate_fts(con: sqlite3.Connection) -> None:
+    # We never read content back out of content_fts, so on SQLite >= 3.43
+    # rebuild it contentless with contentless_delete=1: rowid deletes stay
+    # O(log n) and the duplicate copy of every document is dropped.
+    if sqlite3.sqlite_version_info < (3, 43):
+        return
+    row = con.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='content_fts'"
+    ).fetchone()
+    ddl = (row[0] if row else None) or ""
+    if not ddl or "contentless_delete" in ddl:
+        return
+    with con:
+        con.executescript(
+            """
+            CREATE VIRTUAL TABLE content_fts_new USING fts5(
+              content,
+              content='',
+              contentless_delete=1,
+              tokenize = 'unicode61 remove_diacritics 2'
+            );
+            INSERT INTO content_fts_new(rowid, content)
+              SELECT rowid, content FROM content_fts;
+            DROP TABLE content_fts;
+            ALTER TABLE content_fts_new RENAME TO content_fts;
+            """
+        )
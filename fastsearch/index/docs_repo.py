@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import functools
 import os
 import sqlite3
 import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from .db import DB_PATH, connect
+from .db import DB_PATH, HAS_TRIGRAM, get_connection
+
+__all__ = [
+    "EXT_FILETYPE",
+    "SIZE_BUCKETS",
+    "DATE_BUCKETS",
+    "classify_filetype",
+    "size_bucket",
+    "date_bucket",
+    "normalize_name",
+    "SearchFilters",
+    "DocsRepo",
+]
 
 
 EXT_FILETYPE: Dict[str, str] = {
@@ -31,10 +44,16 @@ EXT_FILETYPE: Dict[str, str] = {
 }
 
 
+# RETURNING and MATERIALIZED CTEs need SQLite >= 3.35; older builds fall
+# back to a SELECT / an unhinted CTE.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+_MATERIALIZED = "MATERIALIZED " if sqlite3.sqlite_version_info >= (3, 35) else ""
+
 SIZE_BUCKETS = ["<1MB", "1–100MB", ">100MB"]
 DATE_BUCKETS = ["Today", "This Week", "This Month", "This Year", "Older"]
 
 
+@functools.lru_cache(maxsize=4096)
 def classify_filetype(ext: str) -> str:
     return EXT_FILETYPE.get(ext.lower(), "Other")
 
@@ -48,23 +67,151 @@ def size_bucket(size_bytes: int) -> str:
     return ">100MB"
 
 
+_DAY_NS = 86_400 * 1_000_000_000
+
+# (second, today_start_ns, year_start_ns) — midnight boundaries are stable
+# within a second, so bulk scans recompute them at most once per second
+# instead of allocating datetime/timedelta objects per file.
+_BUCKET_BOUNDS: Tuple[int, int, int] = (-1, 0, 0)
+
+
 def date_bucket(mtime_ns: int) -> str:
-    dt = datetime.fromtimestamp(mtime_ns / 1e9)
-    now = datetime.now()
-    delta = now - dt
-    if dt.date() == now.date():
+    global _BUCKET_BOUNDS
+    now_ns = time.time_ns()
+    sec = now_ns // 1_000_000_000
+    cached_sec, today_start_ns, year_start_ns = _BUCKET_BOUNDS
+    if sec != cached_sec:
+        now_dt = datetime.fromtimestamp(sec)
+        today_start_ns = int(datetime(now_dt.year, now_dt.month, now_dt.day).timestamp()) * 1_000_000_000
+        year_start_ns = int(datetime(now_dt.year, 1, 1).timestamp()) * 1_000_000_000
+        _BUCKET_BOUNDS = (sec, today_start_ns, year_start_ns)
+    if today_start_ns <= mtime_ns < today_start_ns + _DAY_NS:
         return "Today"
-    if delta <= timedelta(days=7):
+    age_ns = now_ns - mtime_ns
+    if age_ns <= 7 * _DAY_NS:
         return "This Week"
-    if delta <= timedelta(days=31):
+    if age_ns <= 31 * _DAY_NS:
         return "This Month"
-    if dt.year == now.year:
+    if mtime_ns >= year_start_ns:
         return "This Year"
     return "Older"
 
 
-def normalize_name(name: str) -> str:
-    return name.lower()
+# Bound method alias: one C call instead of a Python frame per file.
+normalize_name = str.lower
+
+
+@functools.lru_cache(maxsize=64)
+def _search_sql(
+    within_n: int,
+    ft_n: int,
+    sz_n: int,
+    dt_n: int,
+    loc_n: int,
+    name_branch: str,
+    content: bool,
+    has_q: bool,
+) -> Tuple[str, str]:
+    """Build (results SQL, facets SQL) for a search of the given shape.
+
+    The text depends only on placeholder counts and which candidate
+    branches are active, so per-keystroke calls with the same shape reuse
+    both these strings and sqlite's prepared statements for them.
+    """
+    filter_clauses = ["docs.deleted=0"]
+    # Prefix refinement: when the caller knows the result is a subset of a
+    # previous query's ids, constrain the CTE to that set up front.
+    if within_n:
+        filter_clauses.append(f"docs.id IN ({','.join(['?'] * within_n)})")
+    for field, n in (
+        ("filetype", ft_n),
+        ("size_bucket", sz_n),
+        ("date_bucket", dt_n),
+        ("location_id", loc_n),
+    ):
+        if n:
+            filter_clauses.append(f"docs.{field} IN ({','.join(['?'] * n)})")
+    filter_sql = " AND ".join(filter_clauses)
+
+    candidate_selects: List[str] = []
+    if name_branch == "trigram":
+        # Substring search via the trigram index instead of a
+        # leading-wildcard LIKE scan. The stored path_norm ends with the
+        # file name, so it covers name matches too.
+        candidate_selects.append(
+            "SELECT fd.id, 0.0 AS score FROM name_trigram "
+            "JOIN filtered_docs fd ON fd.id = name_trigram.rowid "
+            "WHERE name_trigram MATCH ?"
+        )
+    elif name_branch == "like":
+        # Queries under three chars have no trigram; name_norm is stored
+        # lowercased so the LIKE skips a per-row LOWER().
+        candidate_selects.append(
+            "SELECT id, 0.0 AS score FROM filtered_docs WHERE (name_norm LIKE ? OR LOWER(path) LIKE ?)"
+        )
+    if content:
+        # bm25 is smaller-is-better; carrying it out of the MATCH lets the
+        # outer ORDER BY rank by relevance instead of a second LIKE pass
+        # over every candidate.
+        candidate_selects.append(
+            "SELECT fd.id, bm25(content_fts) AS score FROM content_fts "
+            "JOIN filtered_docs fd ON fd.id = content_fts.rowid "
+            "WHERE content_fts MATCH ?"
+        )
+    if not has_q:
+        candidate_selects.append("SELECT id, 0.0 AS score FROM filtered_docs")
+
+    raw_sql = " UNION ALL ".join(candidate_selects)
+    cte_clause = (
+        "WITH filtered_docs AS (SELECT * FROM docs WHERE "
+        f"{filter_sql}), "
+        # MATERIALIZED stops the planner flattening the select that calls
+        # bm25() — hoisted out of its MATCH context it errors.
+        f"raw_candidates AS {_MATERIALIZED}({raw_sql}), "
+        # A doc can match both branches; keep its best (lowest) score.
+        # Materialized so multi-branch statements (the facet rollup)
+        # compute the candidate set once.
+        f"candidate_ids AS {_MATERIALIZED}(SELECT id, MIN(score) AS score FROM raw_candidates GROUP BY id) "
+    )
+
+    order_sql = (
+        "CASE WHEN LOWER(fd.name) LIKE ? THEN 0 ELSE 1 END, candidate_ids.score, fd.mtime_ns DESC"
+        if has_q
+        else "fd.mtime_ns DESC"
+    )
+    results_sql = (
+        cte_clause
+        + "SELECT fd.*, COALESCE(locations.path, '') AS location_path "
+        "FROM filtered_docs fd "
+        "JOIN candidate_ids ON candidate_ids.id = fd.id "
+        "LEFT JOIN locations ON locations.id = fd.location_id "
+        f"ORDER BY {order_sql} LIMIT ?"
+    )
+
+    facet_branches = [
+        f"SELECT '{tag}', fd.{tag}, COUNT(*) "
+        "FROM filtered_docs fd "
+        "JOIN candidate_ids ON candidate_ids.id = fd.id "
+        f"GROUP BY fd.{tag}"
+        for tag in ("filetype", "size_bucket", "date_bucket")
+    ]
+    facet_branches.append(
+        "SELECT 'location', locations.path, COUNT(*) "
+        "FROM filtered_docs fd "
+        "JOIN candidate_ids ON candidate_ids.id = fd.id "
+        "JOIN locations ON locations.id = fd.location_id "
+        "GROUP BY locations.path"
+    )
+    facets_sql = cte_clause + " UNION ALL ".join(facet_branches)
+    return results_sql, facets_sql
+
+
+@functools.lru_cache(maxsize=32)
+def _sorted_root_strs(roots: Tuple[Path, ...]) -> Tuple[str, ...]:
+    # Longest-first so the most specific root wins the prefix match.
+    # Scans pass the same root tuple for every file, so stringifying and
+    # sorting once here amortizes across the whole scan.
+    return tuple(sorted((str(r) for r in roots), key=len, reverse=True))
 
 
 @dataclass
@@ -78,74 +225,44 @@ class SearchFilters:
 class DocsRepo:
     def __init__(self, db_path: Path = DB_PATH) -> None:
         self.db_path = db_path
+        # path → id memo; location rows are never deleted, so entries stay
+        # valid for the repo's lifetime — unless the transaction that
+        # inserted one is rolled back (see invalidate_location_cache).
+        self._loc_cache: Dict[str, int] = {}
 
     def _connect(self) -> sqlite3.Connection:
-        return connect(self.db_path)
+        # Per-thread pooled connection; never closed by repo methods.
+        return get_connection(self.db_path)
 
     # Locations map: string path → id
     def ensure_location(self, con: sqlite3.Connection, path: str) -> int:
-        cur = con.execute("SELECT id FROM locations WHERE path=?", (path,))
-        row = cur.fetchone()
-        if row:
-            return int(row[0])
-        cur = con.execute("INSERT INTO locations(path, initial_scan_complete, last_scan_ts, last_scan_count) VALUES(?, 0, 0, 0)", (path,))
-        return int(cur.lastrowid)
-
-    def upsert_file(self, path: Path, root_locations: Sequence[Path], *, connection: sqlite3.Connection | None = None) -> Optional[int]:
-        try:
-            st = path.stat()
-        except FileNotFoundError:
-            return None
-        except PermissionError:
-            return None
-
-        name = path.name
-        parent = str(path.parent)
-        ext = path.suffix.lower()
-        ft = classify_filetype(ext)
-        sb = size_bucket(st.st_size)
-        mbucket = date_bucket(int(st.st_mtime_ns))
-        name_norm = normalize_name(name)
-
-        # Pick closest matching root as location, else parent
-        location_path = None
-        s_path = str(path)
-        for root in sorted(root_locations, key=lambda p: -len(str(p))):
-            if s_path.startswith(str(root)):
-                location_path = str(root)
-                break
-        if location_path is None:
-            location_path = parent
-
-        con = connection or self._connect()
-        manage = connection is None
-        try:
-            doc_id = self._upsert_file_with_con(con, path, root_locations, location_path, name, name_norm, parent, ext, st, ft, sb, mbucket)
-            if manage:
-                con.commit()
-            return doc_id
-        finally:
-            if manage:
-                con.close()
-
-    def _upsert_file_with_con(
-        self,
-        con: sqlite3.Connection,
-        path: Path,
-        root_locations: Sequence[Path],
-        location_path: str,
-        name: str,
-        name_norm: str,
-        parent: str,
-        ext: str,
-        st,
-        ft: str,
-        sb: str,
-        mbucket: str,
-    ) -> Optional[int]:
-        loc_id = self.ensure_location(con, location_path)
-        con.execute(
-                """
+        loc_id = self._loc_cache.get(path)
+        if loc_id is not None:
+            return loc_id
+        cur = con.execute(
+            "INSERT OR IGNORE INTO locations(path, initial_scan_complete, last_scan_ts, last_scan_count) VALUES(?, 0, 0, 0)",
+            (path,),
+        )
+        if cur.rowcount:
+            loc_id = int(cur.lastrowid)
+        else:
+            row = con.execute("SELECT id FROM locations WHERE path=?", (path,)).fetchone()
+            loc_id = int(row[0])
+        self._loc_cache[path] = loc_id
+        return loc_id
+
+    def invalidate_location_cache(self) -> None:
+        """Forget memoized location ids after a rolled-back transaction.
+
+        ensure_location memoizes lastrowid from inside the caller's
+        transaction; if that transaction rolls back, the cached id points
+        at a row that no longer exists and, with foreign_keys on, every
+        later doc upsert for the location raises IntegrityError. Rollback
+        paths must call this before retrying.
+        """
+        self._loc_cache.clear()
+
+    _UPSERT_DOC_SQL = """
                 INSERT INTO docs(path, name, name_norm, parent, ext, size_bytes, mtime_ns, ctime_ns,
                                  filetype, size_bucket, date_bucket, location_id, deleted)
                 VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
@@ -162,47 +279,219 @@ class DocsRepo:
                   date_bucket=excluded.date_bucket,
                   location_id=excluded.location_id,
                   deleted=0
-                """,
-                (
-                    str(path), name, name_norm, parent, ext,
-                    int(st.st_size), int(st.st_mtime_ns), int(st.st_ctime_ns),
-                    ft, sb, mbucket, loc_id,
-                ),
+                """
+
+    def _doc_row(self, s_path: str, st, root_locations: Sequence[Path], location_path: str | None = None) -> Tuple[str, Tuple]:
+        """Derive (location_path, upsert params sans location_id) for a file.
+
+        Takes the path as a plain string so hot callers (watcher events,
+        bulk scans) never pay for a Path object; os.path splits cost a
+        fraction of Path attribute access. Callers that already know the
+        enclosing root (the scanner walks one root at a time) pass it as
+        *location_path* to skip the per-file prefix matching below.
+        """
+        parent, name = os.path.split(s_path)
+        parent = parent or "."
+        ext = os.path.splitext(name)[1].lower()
+        # ext is already lowered; skip classify_filetype's re-lower.
+        ft = EXT_FILETYPE.get(ext, "Other")
+        sb = size_bucket(st.st_size)
+        mbucket = date_bucket(int(st.st_mtime_ns))
+        name_norm = normalize_name(name)
+
+        if location_path is None:
+            # Pick closest matching root as location, else parent
+            for sroot in _sorted_root_strs(tuple(root_locations)):
+                if s_path.startswith(sroot):
+                    location_path = sroot
+                    break
+            if location_path is None:
+                location_path = parent
+        return location_path, (
+            s_path, name, name_norm, parent, ext,
+            int(st.st_size), int(st.st_mtime_ns), int(st.st_ctime_ns),
+            ft, sb, mbucket,
+        )
+
+    def upsert_file(self, path: Path, root_locations: Sequence[Path], *, connection: sqlite3.Connection | None = None, st: os.stat_result | None = None) -> Optional[int]:
+        return self.upsert_file_str(str(path), root_locations, connection=connection, st=st)
+
+    def upsert_file_str(self, path: str, root_locations: Sequence[Path], *, connection: sqlite3.Connection | None = None, st: os.stat_result | None = None) -> Optional[int]:
+        # String-path twin of upsert_file for the watcher's event handler,
+        # which receives str paths from watchdog and would otherwise build a
+        # Path per event just to tear it back apart here. Callers that
+        # already stat'd the file pass the result in to avoid a second
+        # syscall per file.
+        if st is None:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return None
+            except PermissionError:
+                return None
+
+        con = connection or self._connect()
+        manage = connection is None
+        location_path, row = self._doc_row(path, st, root_locations)
+        loc_id = self.ensure_location(con, location_path)
+        params = (*row, loc_id)
+        if _HAS_RETURNING:
+            # The rowid comes back from the upsert itself, saving the
+            # follow-up SELECT on the hottest write path.
+            cur = con.execute(self._UPSERT_DOC_SQL + " RETURNING id", params)
+            found = cur.fetchone()
+        else:
+            con.execute(self._UPSERT_DOC_SQL, params)
+            cur = con.execute("SELECT id FROM docs WHERE path=?", (row[0],))
+            found = cur.fetchone()
+        doc_id = int(found[0]) if found else None
+        if doc_id is not None and HAS_TRIGRAM:
+            con.execute(
+                "INSERT OR REPLACE INTO name_trigram(rowid, path_norm) VALUES(?, ?)",
+                (doc_id, row[0].lower()),
+            )
+        if manage:
+            con.commit()
+        return doc_id
+
+    def upsert_files_bulk(
+        self,
+        con: sqlite3.Connection,
+        paths: Sequence[Path],
+        root_locations: Sequence[Path],
+        stats: Sequence[os.stat_result] | None = None,
+        current_root: Path | None = None,
+    ) -> Dict[str, int]:
+        """Upsert many files in one executemany; returns {path: doc_id}.
+
+        The caller owns the transaction. *stats*, when given, is parallel to
+        *paths* and skips the per-file stat here. *current_root*, when the
+        caller walks a single root, pins every file's location and skips the
+        per-file root matching. Files that vanish or deny access mid-batch
+        are skipped, mirroring upsert_file.
+        """
+        s_root = str(current_root) if current_root is not None else None
+        rows: List[Tuple] = []
+        for i, path in enumerate(paths):
+            if stats is not None:
+                st = stats[i]
+            else:
+                try:
+                    st = os.stat(path)
+                except (FileNotFoundError, PermissionError):
+                    continue
+            location_path, row = self._doc_row(os.fspath(path), st, root_locations, s_root)
+            rows.append((*row, self.ensure_location(con, location_path)))
+        if not rows:
+            return {}
+        con.executemany(self._UPSERT_DOC_SQL, rows)
+        ids: Dict[str, int] = {}
+        path_strs = [r[0] for r in rows]
+        for i in range(0, len(path_strs), 900):
+            chunk = path_strs[i:i + 900]
+            placeholders = ",".join(["?"] * len(chunk))
+            for doc_id, p in con.execute(
+                f"SELECT id, path FROM docs WHERE path IN ({placeholders})", chunk
+            ):
+                ids[str(p)] = int(doc_id)
+        if HAS_TRIGRAM:
+            con.executemany(
+                "INSERT OR REPLACE INTO name_trigram(rowid, path_norm) VALUES(?, ?)",
+                [(ids[p], p.lower()) for p in path_strs if p in ids],
+            )
+        return ids
+
+    def stale_content_ids(self, con: sqlite3.Connection, doc_ids: Sequence[int]) -> List[int]:
+        """Return the subset of *doc_ids* whose content index is out of date.
+
+        A doc is fresh when last_indexed_mtime_ns matches its current
+        mtime_ns; extraction can be skipped for those on re-scans.
+        """
+        stale: List[int] = []
+        for i in range(0, len(doc_ids), 900):
+            chunk = list(doc_ids[i:i + 900])
+            placeholders = ",".join(["?"] * len(chunk))
+            cur = con.execute(
+                f"SELECT id FROM docs WHERE id IN ({placeholders}) "
+                "AND (last_indexed_mtime_ns IS NULL OR last_indexed_mtime_ns != mtime_ns)",
+                chunk,
             )
-        cur = con.execute("SELECT id FROM docs WHERE path=?", (str(path),))
-        row = cur.fetchone()
-        return int(row[0]) if row else None
+            stale.extend(int(r[0]) for r in cur.fetchall())
+        return stale
+
+    def mark_content_indexed(self, con: sqlite3.Connection, doc_ids: Sequence[int]) -> None:
+        con.executemany(
+            "UPDATE docs SET last_indexed_mtime_ns=mtime_ns WHERE id=?",
+            [(int(i),) for i in doc_ids],
+        )
 
     def mark_deleted(self, path: Path) -> None:
+        self.mark_deleted_str(str(path))
+
+    def mark_deleted_str(self, path: str) -> None:
         with self._connect() as con:
-            cur = con.execute("SELECT id FROM docs WHERE path=?", (str(path),))
+            cur = con.execute("SELECT id FROM docs WHERE path=?", (path,))
             row = cur.fetchone()
             if row:
                 doc_id = int(row[0])
                 con.execute("UPDATE docs SET deleted=1 WHERE id=?", (doc_id,))
                 try:
                     con.execute("DELETE FROM content_fts WHERE rowid=?", (doc_id,))
+                    if HAS_TRIGRAM:
+                        con.execute("DELETE FROM name_trigram WHERE rowid=?", (doc_id,))
                 except Exception:
                     pass
 
+    def load_dir_mtimes(self, root: str) -> Dict[str, int]:
+        """Return the cached directory mtimes under *root* as {path: mtime_ns}.
+
+        Range-scanned off the primary key rather than LIKE so no pattern
+        escaping is needed; entries from sibling roots sharing the prefix
+        are harmless extras in the map.
+        """
+        con = self._connect()
+        cur = con.execute(
+            "SELECT path, mtime_ns FROM dir_mtime WHERE path >= ? AND path < ?",
+            (root, root + "\U0010ffff"),
+        )
+        return {str(p): int(m) for p, m in cur.fetchall()}
+
+    def save_dir_mtimes(self, con: sqlite3.Connection, items: Sequence[Tuple[str, int]]) -> None:
+        """Upsert scanned-directory mtimes; the caller owns the transaction."""
+        con.executemany(
+            "INSERT INTO dir_mtime(path, mtime_ns) VALUES(?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET mtime_ns=excluded.mtime_ns",
+            [(p, int(m)) for p, m in items],
+        )
+
     def location_ids_for_paths(self, paths: Sequence[str]) -> List[int]:
+        # One IN query per chunk instead of a round trip per path; chunked
+        # to stay under SQLite's host-parameter limit (999 in older builds).
         if not paths:
             return []
-        with self._connect() as con:
-            placeholders = ",".join(["?"] * len(paths))
+        con = self._connect()
+        ids: List[int] = []
+        for i in range(0, len(paths), 900):
+            chunk = list(paths[i:i + 900])
+            placeholders = ",".join(["?"] * len(chunk))
             cur = con.execute(
                 f"SELECT id FROM locations WHERE path IN ({placeholders})",
-                list(paths),
+                chunk,
             )
-            return [int(r[0]) for r in cur.fetchall()]
+            ids.extend(int(r[0]) for r in cur.fetchall())
+        return ids
 
     def count_docs_for_location_paths(self, paths: Sequence[str]) -> int:
         if not paths:
             return 0
         with self._connect() as con:
             placeholders = ",".join(["?"] * len(paths))
+            # Plain join instead of an IN-subquery: locations resolve via
+            # the unique path index, docs via the partial location index.
             cur = con.execute(
-                f"SELECT COUNT(*) FROM docs WHERE deleted=0 AND location_id IN (SELECT id FROM locations WHERE path IN ({placeholders}))",
+                "SELECT COUNT(*) FROM docs "
+                "JOIN locations ON locations.id = docs.location_id "
+                f"WHERE docs.deleted=0 AND locations.path IN ({placeholders})",
                 list(paths),
             )
             row = cur.fetchone()
@@ -238,134 +527,117 @@ class DocsRepo:
             return []
         root_strs = [str(p) for p in roots]
         placeholders = ",".join(["?"] * len(root_strs))
+        # Keyset pagination on docs.id: OFFSET re-walks all previously
+        # skipped rows on every page, so paging a large backlog went
+        # quadratic. Each batch is fetched eagerly, so no cursor is held
+        # open between yields while the consumer drains the queue.
         sql = (
-            "SELECT docs.path FROM docs "
+            "SELECT docs.id, docs.path FROM docs "
             "LEFT JOIN content_fts ON content_fts.rowid = docs.id "
-            f"WHERE docs.deleted=0 AND content_fts.rowid IS NULL AND docs.location_id IN (SELECT id FROM locations WHERE path IN ({placeholders})) "
-            "LIMIT ? OFFSET ?"
+            f"WHERE docs.id > ? AND docs.deleted=0 AND content_fts.rowid IS NULL AND docs.location_id IN (SELECT id FROM locations WHERE path IN ({placeholders})) "
+            "ORDER BY docs.id LIMIT ?"
         )
         with self._connect() as con:
-            offset = 0
+            last_id = 0
             while True:
-                cur = con.execute(sql, (*root_strs, batch, offset))
+                cur = con.execute(sql, (last_id, *root_strs, batch))
                 rows = cur.fetchall()
                 if not rows:
                     break
-                yield [Path(r[0]) for r in rows]
-                offset += len(rows)
+                last_id = int(rows[-1][0])
+                yield [Path(r[1]) for r in rows]
 
 
 
-    def search(self, query: str, filters: SearchFilters, limit: int = 500, mode: str = "all") -> Tuple[List[sqlite3.Row], Dict[str, Dict[str, int]]]:
+    def search(
+        self,
+        query: str,
+        filters: SearchFilters,
+        limit: int = 500,
+        mode: str = "all",
+        cancel_check: Callable[[], bool] | None = None,
+        within_ids: Sequence[int] | None = None,
+        as_columns: bool = False,
+    ) -> Tuple[List[sqlite3.Row] | Dict[str, list], Dict[str, Dict[str, int]]]:
         q = (query or "").strip()
-        filter_params: List[object] = []
 
-        filter_clauses = ["docs.deleted=0"]
-
-        def add_in(field: str, values: Optional[Sequence[object]]) -> None:
+        # SQL text depends only on the query *shape*; build the parameter
+        # list here and let the lru-cached _search_sql supply the strings.
+        base_params: List[object] = []
+        if within_ids:
+            base_params.extend(int(i) for i in within_ids)
+        for values in (filters.filetypes, filters.size_buckets, filters.date_buckets, filters.location_ids):
             if values:
-                if "." not in field:
-                    field = f"docs.{field}"
-                placeholders = ",".join(["?"] * len(values))
-                filter_clauses.append(f"{field} IN ({placeholders})")
-                filter_params.extend(values)
-
-        add_in("filetype", filters.filetypes)
-        add_in("size_bucket", filters.size_buckets)
-        add_in("date_bucket", filters.date_buckets)
-        add_in("location_id", filters.location_ids)
-
-        filter_sql = " AND ".join(filter_clauses) if filter_clauses else "1"
-
-        candidate_selects: List[str] = []
-        candidate_params: List[object] = []
-
-        def like_params(text: str) -> List[str]:
-            like = f"%{text.lower()}%"
-            return [like, like]
+                base_params.extend(values)
 
+        name_branch = ""
+        content = False
         if q:
             if mode in ("filename", "all"):
-                candidate_selects.append(
-                    "SELECT id FROM filtered_docs WHERE (LOWER(name) LIKE ? OR LOWER(path) LIKE ?)"
-                )
-                candidate_params.extend(like_params(q))
+                if HAS_TRIGRAM and len(q) >= 3:
+                    name_branch = "trigram"
+                    base_params.append('"' + q.lower().replace('"', '') + '"')
+                else:
+                    name_branch = "like"
+                    like = f"%{q.lower()}%"
+                    base_params.extend((like, like))
             if mode in ("content", "all"):
                 from .fts import build_match_query
 
                 match = build_match_query(q)
                 if match:
-                    candidate_selects.append(
-                        "SELECT fd.id FROM content_fts "
-                        "JOIN filtered_docs fd ON fd.id = content_fts.rowid "
-                        "WHERE content_fts MATCH ?"
-                    )
-                    candidate_params.append(match)
-        else:
-            candidate_selects.append("SELECT id FROM filtered_docs")
-
-        candidate_sql = " UNION ".join(candidate_selects)
-        cte_clause = (
-            "WITH filtered_docs AS (SELECT * FROM docs WHERE "
-            f"{filter_sql}), "
-            f"candidate_ids AS ({candidate_sql}) "
-        )
-
-        order_sql = (
-            "CASE WHEN LOWER(fd.name) LIKE ? THEN 0 ELSE 1 END, fd.mtime_ns DESC"
-            if q
-            else "fd.mtime_ns DESC"
+                    content = True
+                    base_params.append(match)
+
+        sql, facet_sql = _search_sql(
+            len(within_ids) if within_ids else 0,
+            len(filters.filetypes or ()),
+            len(filters.size_buckets or ()),
+            len(filters.date_buckets or ()),
+            len(filters.location_ids or ()),
+            name_branch,
+            content,
+            bool(q),
         )
         order_params: List[object] = [f"%{q.lower()}%"] if q else []
-        base_params = [*filter_params, *candidate_params]
 
-        sql = (
-            cte_clause
-            + "SELECT fd.*, locations.path AS location_path "
-            "FROM filtered_docs fd "
-            "JOIN candidate_ids ON candidate_ids.id = fd.id "
-            "LEFT JOIN locations ON locations.id = fd.location_id "
-            f"ORDER BY {order_sql} LIMIT ?"
-        )
-
-        with self._connect() as con:
-            con.execute("PRAGMA query_only=1")
-            rows = con.execute(sql, (*base_params, *order_params, limit)).fetchall()
-
-            facets: Dict[str, Dict[str, int]] = {}
-
-            def facet_counts(column: str) -> Dict[str, int]:
-                cur = con.execute(
-                    cte_clause
-                    + f"SELECT {column}, COUNT(*) "
-                    "FROM filtered_docs fd "
-                    "JOIN candidate_ids ON candidate_ids.id = fd.id "
-                    f"GROUP BY {column}",
-                    (*base_params,),
-                )
-                out: Dict[str, int] = {}
-                for r in cur.fetchall():
-                    key = r[0]
-                    key = str(key) if key is not None else ""
-                    out[key] = int(r[1])
-                return out
-
-            facets["filetype"] = facet_counts("fd.filetype")
-            facets["size_bucket"] = facet_counts("fd.size_bucket")
-            facets["date_bucket"] = facet_counts("fd.date_bucket")
-
-            loc_counts: Dict[str, int] = {}
-            cur = con.execute(
-                cte_clause
-                + "SELECT locations.path, COUNT(*) "
-                "FROM filtered_docs fd "
-                "JOIN candidate_ids ON candidate_ids.id = fd.id "
-                "JOIN locations ON locations.id = fd.location_id "
-                "GROUP BY locations.path",
-                (*base_params,),
-            )
-            for r in cur.fetchall():
-                loc_counts[str(r[0])] = int(r[1])
-            facets["location"] = loc_counts
+        con = self._connect()
+        con.execute("PRAGMA query_only=1")
+        if cancel_check is not None:
+            # Abort mid-query (sqlite raises OperationalError) as soon as
+            # the caller reports the query is stale.
+            con.set_progress_handler(lambda: 1 if cancel_check() else 0, 10000)
+        try:
+            if as_columns:
+                # Plain tuples skip per-row sqlite3.Row construction; the
+                # transpose yields one list per column for the UI payload.
+                cur = con.cursor()
+                cur.row_factory = None  # type: ignore[assignment]
+                cur.execute(sql, (*base_params, *order_params, limit))
+                names = [d[0] for d in cur.description]
+                raw = cur.fetchall()
+                if raw:
+                    rows: List[sqlite3.Row] | Dict[str, list] = dict(
+                        zip(names, (list(c) for c in zip(*raw)))
+                    )
+                else:
+                    rows = {name: [] for name in names}
+            else:
+                rows = con.execute(sql, (*base_params, *order_params, limit)).fetchall()
+
+            # All four facet rollups in one statement: the materialized
+            # candidate set is computed once instead of once per facet.
+            facets: Dict[str, Dict[str, int]] = {
+                "filetype": {}, "size_bucket": {}, "date_bucket": {}, "location": {},
+            }
+            cur = con.execute(facet_sql, (*base_params,))
+            for tag, key, count in cur.fetchall():
+                facets[tag][str(key) if key is not None else ""] = int(count)
 
             return rows, facets
+        finally:
+            # The connection is shared with writers on this thread, so undo
+            # the read-only mode and the cancellation hook.
+            if cancel_check is not None:
+                con.set_progress_handler(None, 0)
+            con.execute("PRAGMA query_only=0")
@@ -1,29 +1,46 @@
 from __future__ import annotations
 
+import re
 import sqlite3
 from typing import Optional
 
-from .db import connect
+from .db import get_connection
 
 
-def upsert_doc_content(doc_id: int, content: str) -> None:
-    # Replace existing row then insert new content
-    with connect() as con:
-        con.execute("DELETE FROM content_fts WHERE rowid=?", (doc_id,))
-        con.execute("INSERT INTO content_fts(rowid, content) VALUES(?, ?)", (doc_id, content))
+def upsert_doc_content(doc_id: int, content: str, con: Optional[sqlite3.Connection] = None) -> None:
+    # OR REPLACE folds the speculative DELETE + INSERT into one statement
+    # (FTS5 handles the rowid conflict internally). With an explicit
+    # connection the caller owns the transaction; otherwise the per-thread
+    # pooled connection is used and committed here.
+    manage = con is None
+    if con is None:
+        con = get_connection()
+    con.execute("INSERT OR REPLACE INTO content_fts(rowid, content) VALUES(?, ?)", (doc_id, content))
+    if manage:
+        con.commit()
 
 
-def delete_doc_content(doc_id: int) -> None:
-    with connect() as con:
-        con.execute("DELETE FROM content_fts WHERE rowid=?", (doc_id,))
+def delete_doc_content(doc_id: int, con: Optional[sqlite3.Connection] = None) -> None:
+    manage = con is None
+    if con is None:
+        con = get_connection()
+    con.execute("DELETE FROM content_fts WHERE rowid=?", (doc_id,))
+    if manage:
+        con.commit()
+
+
+_TOKEN_STRIP = re.compile(r"\W+", re.UNICODE)
 
 
 def build_match_query(text: str) -> str:
-    # Simple tokenizer: AND over whitespace tokens with prefix
-    tokens = [t for t in text.strip().split() if t]
-    if not tokens:
-        return ""
-    # Escape quotes
-    toks = [t.replace('"', ' ') for t in tokens]
-    return " ".join(f"{t}*" for t in toks)
+    # Implicit AND over whitespace tokens, each a quoted prefix phrase.
+    # Stripping non-word characters and quoting keeps user input like
+    # foo-bar or OR from reaching the FTS5 query parser as operators.
+    out = []
+    for t in text.strip().split():
+        t = _TOKEN_STRIP.sub("", t)
+        if len(t) < 2:
+            continue
+        out.append(f'"{t}"*')
+    return " ".join(out)
 
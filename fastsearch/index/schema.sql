@@ -25,6 +25,9 @@ CREATE TABLE IF NOT EXISTS docs (
   date_bucket TEXT NOT NULL,
   location_id INTEGER,
   deleted INTEGER NOT NULL DEFAULT 0,
+  -- mtime_ns captured at the last successful content-index pass; NULL
+  -- until the file's content has been extracted once.
+  last_indexed_mtime_ns INTEGER,
   FOREIGN KEY(location_id) REFERENCES locations(id)
 );
 
@@ -34,6 +37,22 @@ CREATE INDEX IF NOT EXISTS idx_docs_parent ON docs(parent);
 CREATE INDEX IF NOT EXISTS idx_docs_mtime ON docs(mtime_ns);
 CREATE INDEX IF NOT EXISTS idx_docs_buckets ON docs(size_bucket, date_bucket, filetype);
 CREATE INDEX IF NOT EXISTS idx_docs_location ON docs(location_id);
+CREATE INDEX IF NOT EXISTS idx_docs_name_norm ON docs(name_norm);
+
+-- Partial indexes for the search path: filters always include deleted=0
+-- and results are ordered by mtime_ns DESC.
+CREATE INDEX IF NOT EXISTS idx_docs_live_mtime ON docs(mtime_ns DESC) WHERE deleted=0;
+CREATE INDEX IF NOT EXISTS idx_docs_loc_mtime ON docs(location_id, mtime_ns DESC) WHERE deleted=0;
+CREATE INDEX IF NOT EXISTS idx_docs_ft_mtime ON docs(filetype, mtime_ns DESC) WHERE deleted=0;
+
+-- Directory mtimes captured at the end of a completed scan; a directory
+-- whose mtime is unchanged on a later scan has the same direct entries,
+-- so its files can be skipped (subdirectories are still descended —
+-- mtime does not propagate upward).
+CREATE TABLE IF NOT EXISTS dir_mtime (
+  path TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL
+);
 
 -- Full-text search over extracted content (rowid aligned to docs.id)
 CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
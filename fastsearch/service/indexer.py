@@ -1,22 +1,40 @@
 from __future__ import annotations
 
+import os
+import stat as stat_module
 import threading
-from queue import Queue, Empty
+from queue import SimpleQueue, Empty
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Optional, Sequence, Union
 
 from fastsearch.extractors.router import extract_text_for_index
+from fastsearch.index.db import get_connection
+from fastsearch.index.docs_repo import DocsRepo
 from fastsearch.index.fts import upsert_doc_content, delete_doc_content
 
 
+# Dedicated stop marker: unlike the old Path("/dev/null") sentinel it can
+# never collide with real work items.
+_STOP = object()
+
+
 class ContentIndexer:
+    # Files committed per transaction during queue drains; one WAL commit
+    # per batch instead of one fsync pair per file.
+    BATCH_SIZE = 200
+
     def __init__(self, workers: int = 2, *, roots: Sequence[Path] | None = None, settings=None) -> None:
-        self.q: Queue[Path] = Queue(maxsize=10000)
+        # SimpleQueue's C implementation has less per-item locking overhead
+        # than Queue and this pipeline never needed the maxsize bound.
+        self.q: SimpleQueue[Union[Path, object]] = SimpleQueue()
         self._threads: list[threading.Thread] = []
         self._stop = threading.Event()
         self._workers = max(1, workers)
         self._settings = settings
         self._roots: tuple[Path, ...] | None = tuple(roots) if roots else None
+        # Shared across workers: DocsRepo is stateless apart from the
+        # location-id cache, which all threads can safely reuse.
+        self._repo = DocsRepo()
 
     def set_roots(self, roots: Sequence[Path]) -> None:
         self._roots = tuple(roots)
@@ -32,7 +50,7 @@ class ContentIndexer:
     def stop(self) -> None:
         self._stop.set()
         for _ in self._threads:
-            self.q.put_nowait(Path("/dev/null"))
+            self.q.put_nowait(_STOP)
         for t in self._threads:
             t.join(timeout=2.0)
         self._threads.clear()
@@ -43,32 +61,126 @@ class ContentIndexer:
         except Exception:
             pass
 
+    def enqueue_many(self, paths: Sequence[Path]) -> None:
+        # Preferred over per-path enqueue() on the scan path: one call and
+        # one bound-method lookup per batch instead of per file. SimpleQueue
+        # puts are lock-free on CPython, so no mutex batching is needed.
+        put = self.q.put_nowait
+        try:
+            for p in paths:
+                put(p)
+        except Exception:
+            pass
+
     def queue_size(self) -> int:
         return self.q.qsize()
 
     def _run(self) -> None:
+        # One pooled connection per worker thread (db.get_connection is
+        # thread-local); opening three connections per file made connect()
+        # overhead dominate small-file indexing.
+        con = get_connection()
         while not self._stop.is_set():
             try:
-                p = self.q.get(timeout=0.5)
+                item = self.q.get(timeout=0.5)
             except Empty:
                 continue
+            if item is _STOP:
+                break
+            # Drain whatever else is already queued so a cold scan commits
+            # once per batch rather than once per file.
+            batch = [item]
+            stopping = False
             try:
-                if not p.exists() or not p.is_file():
-                    continue
-                from fastsearch.index.docs_repo import DocsRepo
-                repo = DocsRepo()
-                roots = self._roots if self._roots else (p.parent,)
-                doc_id = repo.upsert_file(p, roots)
-                if not doc_id:
-                    continue
-                text = extract_text_for_index(p, self._settings)
-                if text:
-                    upsert_doc_content(doc_id, text)
-                else:
-                    # ensure remove if previously existed
-                    delete_doc_content(doc_id)
-            except Exception:
+                while len(batch) < self.BATCH_SIZE:
+                    nxt = self.q.get_nowait()
+                    if nxt is _STOP:
+                        stopping = True
+                        break
+                    batch.append(nxt)
+            except Empty:
                 pass
-            finally:
-                self.q.task_done()
+            try:
+                con.execute("BEGIN IMMEDIATE")
+                self._index_batch(con, batch)
+                con.execute("COMMIT")
+            except Exception:
+                try:
+                    con.rollback()
+                except Exception:
+                    pass
+                # The rollback may have discarded location rows whose ids
+                # are memoized; a stale id would fail every retry below.
+                self._repo.invalidate_location_cache()
+                # One bad file must not discard the batch: retry per item.
+                for item in batch:
+                    try:
+                        self._index_one(con, item)
+                        con.commit()
+                    except Exception:
+                        try:
+                            con.rollback()
+                        except Exception:
+                            pass
+                        self._repo.invalidate_location_cache()
+            if stopping:
+                break
+
+    def _index_batch(self, con, batch: list[Path]) -> None:
+        # One executemany upsert for the whole batch reuses the prepared
+        # statement; content extraction still runs per file. A single
+        # os.stat per path replaces the exists/is_file/stat triple and is
+        # reused by the upsert.
+        files: list[Path] = []
+        stats: list[os.stat_result] = []
+        for p in batch:
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            if stat_module.S_ISREG(st.st_mode):
+                files.append(p)
+                stats.append(st)
+        if not files:
+            return
+        roots = self._roots if self._roots else tuple({p.parent for p in files})
+        ids = self._repo.upsert_files_bulk(con, files, roots, stats=stats)
+        # Extraction dominates re-scans; skip files whose content was
+        # already indexed at their current mtime.
+        stale = set(self._repo.stale_content_ids(con, list(ids.values())))
+        done: list[int] = []
+        for p in files:
+            doc_id = ids.get(str(p))
+            if not doc_id or doc_id not in stale:
+                continue
+            text = extract_text_for_index(p, self._settings)
+            if text:
+                upsert_doc_content(doc_id, text, con=con)
+            else:
+                # ensure remove if previously existed
+                delete_doc_content(doc_id, con=con)
+            done.append(doc_id)
+        if done:
+            self._repo.mark_content_indexed(con, done)
+
+    def _index_one(self, con, p: Path) -> None:
+        try:
+            st = os.stat(p)
+        except OSError:
+            return
+        if not stat_module.S_ISREG(st.st_mode):
+            return
+        roots = self._roots if self._roots else (p.parent,)
+        doc_id = self._repo.upsert_file(p, roots, connection=con, st=st)
+        if not doc_id:
+            return
+        if not self._repo.stale_content_ids(con, [doc_id]):
+            return
+        text = extract_text_for_index(p, self._settings)
+        if text:
+            upsert_doc_content(doc_id, text, con=con)
+        else:
+            # ensure remove if previously existed
+            delete_doc_content(doc_id, con=con)
+        self._repo.mark_content_indexed(con, [doc_id])
 
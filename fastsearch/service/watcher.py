@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import fnmatch
 import logging
+import os
+import re
+import stat as stat_module
+import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Iterable, List, Sequence, Set
+from typing import TYPE_CHECKING, Callable, Iterable, List, Sequence, Set
 
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
-from watchdog.observers import Observer
+
+if TYPE_CHECKING:
+    from watchdog.observers import Observer
 
 from fastsearch.config.settings import default_exclude_names
 from fastsearch.index.docs_repo import DocsRepo
@@ -18,8 +27,26 @@ from .indexer import ContentIndexer
 log = logging.getLogger(__name__)
 
 
+# dir_fd-relative stat (the os.fwalk trick) is POSIX-only; Windows falls
+# back to DirEntry.stat on the full path.
+_HAS_DIR_FD = os.stat in os.supports_dir_fd
+
 _BASE_EXCLUDES = [".git", "node_modules", "venv", ".venv", "__pycache__", ".idea", ".vscode"]
-DEFAULT_EXCLUDES = default_exclude_names(_BASE_EXCLUDES) or {name.lower() for name in _BASE_EXCLUDES}
+# Built-in defaults, case-folded once; importing this module no longer
+# touches the settings file — user overrides resolve in build_excludes().
+DEFAULT_EXCLUDES = frozenset(n.casefold() for n in _BASE_EXCLUDES)
+# Alias retained for existing importers; DEFAULT_EXCLUDES is already folded.
+DEFAULT_EXCLUDES_LOWER = DEFAULT_EXCLUDES
+
+
+def build_excludes() -> frozenset:
+    """Resolve the exclude-name set, preferring configured overrides.
+
+    Called when a WatcherConfig is being built rather than at import, so
+    settings-file reads happen at config-load time and pick up edits made
+    after the process started.
+    """
+    return frozenset(default_exclude_names(_BASE_EXCLUDES) or DEFAULT_EXCLUDES)
 
 
 @dataclass
@@ -27,45 +54,132 @@ class WatcherConfig:
     roots: Sequence[Path]
     exclude_dir_names: Set[str]
     skip_initial_if_index_present: bool = True
+    # Absolute directory prefixes to prune wholesale, e.g. one giant
+    # node_modules under an otherwise-watched root. Unlike
+    # exclude_dir_names these match full paths, not entry names.
+    exclude_path_prefixes: Sequence[Path] = ()
+
+    def __post_init__(self) -> None:
+        # Case-folded once here so the walker's per-directory membership
+        # test needs no normalization of the exclude set itself.
+        self.excludes_cf = frozenset(n.casefold() for n in self.exclude_dir_names)
+        # Normalized with a trailing separator so "/a/b" can't match
+        # "/a/bc"; str.startswith takes the whole tuple in one C call, so
+        # no trie is needed for realistic prefix counts.
+        self.exclude_prefixes_cf = tuple(
+            sorted({os.fspath(p).casefold().rstrip(os.sep) + os.sep for p in self.exclude_path_prefixes})
+        )
+        # Glob-style entries (e.g. ".cache*") are compiled into one
+        # alternation regex so N patterns cost a single C-level scan per
+        # directory name; plain names stay in the frozenset lookup above.
+        glob_pats = sorted(n for n in self.exclude_dir_names if any(c in n for c in "*?["))
+        self.exclude_name_re = (
+            re.compile("|".join(fnmatch.translate(n.casefold()) for n in glob_pats))
+            if glob_pats
+            else None
+        )
 
 
 class _Handler(FileSystemEventHandler):
+    # Editors and build tools emit bursts of modify events per save; modify
+    # events within this window of the last one for the same path are
+    # dropped, collapsing a burst into a single upsert + index job.
+    DEBOUNCE_S = 0.25
+    # Evict stale debounce entries once the map grows past this.
+    _DEBOUNCE_SWEEP = 10_000
+
     def __init__(self, repo: DocsRepo, roots: Sequence[Path], indexer: ContentIndexer | None) -> None:
         super().__init__()
         self.repo = repo
         self.roots = roots
         self.indexer = indexer
+        self._last_modified: dict[str, float] = {}
+        self._last_lock = threading.Lock()
+        # Trailing edge of the debounce: suppressed paths collect here and
+        # a lazily started flusher thread re-processes them once the burst
+        # settles, so the file's final state always gets recorded.
+        self._pending: set[str] = set()
+        self._pending_cond = threading.Condition(self._last_lock)
+        self._flusher: threading.Thread | None = None
+
+    # Event callbacks keep paths as the raw strings watchdog hands over;
+    # building a Path per event is pure allocation overhead during change
+    # storms (builds, VCS checkouts). Path is constructed only lazily for
+    # the indexer queue, whose consumers still work in Path terms.
 
     def on_created(self, event: FileSystemEvent):  # type: ignore[override]
         if event.is_directory:
             return
-        p = Path(event.src_path)
-        self.repo.upsert_file(p, self.roots)
+        self.repo.upsert_file_str(event.src_path, self.roots)
         if self.indexer:
-            self.indexer.enqueue(p)
+            self.indexer.enqueue(Path(event.src_path))
 
     def on_modified(self, event: FileSystemEvent):  # type: ignore[override]
         if event.is_directory:
             return
-        p = Path(event.src_path)
-        self.repo.upsert_file(p, self.roots)
+        now = time.monotonic()
+        with self._last_lock:
+            if now - self._last_modified.get(event.src_path, 0.0) < self.DEBOUNCE_S:
+                # Don't drop the event outright: the leading upsert may have
+                # caught a mid-write file, so park the path for a trailing
+                # flush once the window closes — the last write wins.
+                self._pending.add(event.src_path)
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._flush_pending, name="ModifyDebounce", daemon=True
+                    )
+                    self._flusher.start()
+                self._pending_cond.notify()
+                return
+            self._last_modified[event.src_path] = now
+            if len(self._last_modified) > self._DEBOUNCE_SWEEP:
+                cutoff = now - self.DEBOUNCE_S
+                self._last_modified = {
+                    p: t for p, t in self._last_modified.items() if t >= cutoff
+                }
+        self._process_modified(event.src_path)
+
+    def _process_modified(self, src_path: str) -> None:
+        self.repo.upsert_file_str(src_path, self.roots)
         if self.indexer:
-            self.indexer.enqueue(p)
+            self.indexer.enqueue(Path(src_path))
+
+    def _flush_pending(self) -> None:
+        # Long-lived daemon so the trailing upserts reuse one pooled
+        # connection rather than opening one per burst.
+        while True:
+            with self._pending_cond:
+                while not self._pending:
+                    self._pending_cond.wait()
+            # Let the burst settle for one debounce window before flushing
+            # whatever accumulated; sleeping outside the lock keeps later
+            # notifies from cutting the window short.
+            time.sleep(self.DEBOUNCE_S)
+            with self._pending_cond:
+                pending = list(self._pending)
+                self._pending.clear()
+                now = time.monotonic()
+                for p in pending:
+                    self._last_modified[p] = now
+            for p in pending:
+                try:
+                    self._process_modified(p)
+                except Exception:
+                    log.exception("Trailing modify flush failed for %s", p)
 
     def on_moved(self, event):  # type: ignore[override]
         if event.is_directory:
             return
         if getattr(event, "dest_path", None):
-            p = Path(event.dest_path)
-            self.repo.upsert_file(p, self.roots)
+            self.repo.upsert_file_str(event.dest_path, self.roots)
             if self.indexer:
-                self.indexer.enqueue(p)
-        self.repo.mark_deleted(Path(event.src_path))
+                self.indexer.enqueue(Path(event.dest_path))
+        self.repo.mark_deleted_str(event.src_path)
 
     def on_deleted(self, event: FileSystemEvent):  # type: ignore[override]
         if event.is_directory:
             return
-        self.repo.mark_deleted(Path(event.src_path))
+        self.repo.mark_deleted_str(event.src_path)
 
 
 class WatchService:
@@ -73,16 +187,24 @@ class WatchService:
         self.repo = repo
         self.cfg = cfg
         self.indexer = indexer
-        self._observers: List[Observer] = []
+        self._observer: Observer | None = None
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
         self._on_status: Callable[[str], None] | None = None
         self._last_queue_depth: int = -1
+        self._last_emit: float = 0.0
 
     def on_status(self, fn: Callable[[str], None]) -> None:
         self._on_status = fn
 
-    def _emit_status(self, msg: str) -> None:
+    def _emit_status(self, msg: str, *, force: bool = False) -> None:
+        # Progress updates are throttled to ~5/s so a fast scan doesn't
+        # hammer the GUI thread and the log with hundreds of messages a
+        # second; terminal/state-change messages pass force=True.
+        now = time.monotonic()
+        if not force and now - self._last_emit < 0.2:
+            return
+        self._last_emit = now
         log.info(msg)
         if self._on_status:
             self._on_status(msg)
@@ -94,40 +216,105 @@ class WatchService:
         if depth == self._last_queue_depth:
             return
         self._last_queue_depth = depth
-        self._emit_status(f"Content indexing queue depth: {depth}")
+        # Already deduplicated on depth change, so it bypasses the timer.
+        self._emit_status(f"Content indexing queue depth: {depth}", force=True)
+
+    # Files accumulated before each bulk upsert + commit during a scan.
+    SCAN_BATCH = 500
 
     def _scan_root(self, root: Path) -> None:
+        _lower_thread_priority()
         scanned = 0
-        self._emit_status(f"Indexing {root}…")
+        self._emit_status(f"Indexing {root}…", force=True)
         # ensure progress entry exists
         self.repo.update_location_scan_state(str(root), complete=False, last_scan_count=0)
-        conn = self.repo._connect()
+
+        # Two-stage pipeline: this thread walks the tree (I/O bound) while a
+        # writer thread drains batches into SQLite, so directory reads
+        # overlap the upsert/commit work. The bounded queue gives natural
+        # backpressure — the walker blocks on put() if the writer lags.
+        batch_q: Queue = Queue(maxsize=8)
+        writer_error: List[BaseException] = []
+
+        def writer() -> None:
+            nonlocal scanned
+            conn = self.repo._connect()
+            while True:
+                batch = batch_q.get()
+                if batch is None:
+                    return
+                paths, stats = batch
+                try:
+                    # One executemany per batch instead of a statement per file.
+                    self.repo.upsert_files_bulk(
+                        conn, paths, self.cfg.roots, stats=stats, current_root=root
+                    )
+                    conn.commit()
+                except BaseException as exc:
+                    conn.rollback()
+                    # Drop location ids memoized inside the rolled-back
+                    # transaction; they may no longer exist.
+                    self.repo.invalidate_location_cache()
+                    writer_error.append(exc)
+                    # Keep draining so the producer's bounded put() (and the
+                    # final sentinel) can never block on a dead writer.
+                    while batch_q.get() is not None:
+                        pass
+                    return
+                if self.indexer:
+                    self.indexer.enqueue_many(paths)
+                scanned += len(paths)
+                self.repo.update_location_scan_state(str(root), last_scan_count=scanned)
+                self._emit_status(f"Indexing {root}… {scanned} files")
+                self._emit_queue_status()
+
+        writer_thread = threading.Thread(target=writer, name="ScanWriter", daemon=True)
+        writer_thread.start()
+        batch_paths: List[Path] = []
+        batch_stats: List[os.stat_result] = []
+        stopped = False
+        # Directories whose mtime matches the last completed scan are
+        # pruned by the walker; freshly scanned ones collect in dir_updates
+        # and are persisted only if this scan runs to completion.
+        dir_mtimes = self.repo.load_dir_mtimes(str(root))
+        dir_updates: List[tuple] = []
         try:
-            for dirpath, dirnames, filenames in os_walk_filtered(root, self.cfg.exclude_dir_names):
-                for fn in filenames:
-                    p = Path(dirpath) / fn
-                    self.repo.upsert_file(p, self.cfg.roots, connection=conn)
-                    if self.indexer:
-                        self.indexer.enqueue(p)
-                    scanned += 1
-                    if scanned % 500 == 0:
-                        conn.commit()
-                        self.repo.update_location_scan_state(str(root), last_scan_count=scanned)
-                        self._emit_status(f"Indexing {root}… {scanned} files")
-                        self._emit_queue_status()
-                    if self._stop_event.is_set():
-                        conn.commit()
-                        self._emit_queue_status()
-                        return
-            conn.commit()
-            self._emit_queue_status()
-        except Exception:
-            conn.rollback()
-            raise
+            for entry, st in _scandir_walk(
+                str(root),
+                self.cfg.excludes_cf,
+                self.cfg.exclude_prefixes_cf,
+                self.cfg.exclude_name_re,
+                dir_mtimes,
+                dir_updates,
+            ):
+                # The walker already stat'd each file (fd-relative where the
+                # platform supports it); the bulk upsert takes it
+                # pre-fetched, so there is one stat per file total.
+                batch_paths.append(Path(entry.path))
+                batch_stats.append(st)
+                if len(batch_paths) >= self.SCAN_BATCH:
+                    batch_q.put((batch_paths, batch_stats))
+                    batch_paths = []
+                    batch_stats = []
+                if self._stop_event.is_set() or writer_error:
+                    stopped = True
+                    break
+            if batch_paths and not writer_error:
+                batch_q.put((batch_paths, batch_stats))
         finally:
-            conn.close()
+            batch_q.put(None)
+            writer_thread.join()
+        if writer_error:
+            raise writer_error[0]
+        self._emit_queue_status()
+        if stopped:
+            return
+        if dir_updates:
+            conn = self.repo._connect()
+            self.repo.save_dir_mtimes(conn, dir_updates)
+            conn.commit()
         self.repo.update_location_scan_state(str(root), complete=True, last_scan_count=scanned)
-        self._emit_status(f"Indexing complete for {root} ({scanned} files)")
+        self._emit_status(f"Indexing complete for {root} ({scanned} files)", force=True)
 
     def start(self) -> None:
         if self.indexer:
@@ -141,12 +328,23 @@ class WatchService:
                 to_scan.append(root)
         if not to_scan and self.cfg.skip_initial_if_index_present:
             existing = self.repo.count_docs_for_location_paths([str(p) for p in self.cfg.roots])
-            self._emit_status(f"Loaded index ({existing} files)")
+            self._emit_status(f"Loaded index ({existing} files)", force=True)
+        elif len(to_scan) == 1:
+            self._scan_root(to_scan[0])
         else:
-            for root in to_scan:
-                if self._stop_event.is_set():
-                    break
-                self._scan_root(root)
+            # Roots usually live on independent devices (or at least
+            # independent directory trees), so scanning them concurrently
+            # overlaps their directory I/O. get_connection gives each scan
+            # thread its own SQLite connection; _stop_event is checked
+            # inside _scan_root, so stop() still takes effect mid-scan.
+            workers = min(len(to_scan), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ScanRoot") as pool:
+                futures = [pool.submit(self._scan_root, root) for root in to_scan]
+                for fut in as_completed(futures):
+                    try:
+                        fut.result()
+                    except Exception:
+                        log.exception("Initial scan failed for a root")
 
         # Enqueue any docs missing content for background indexing
         try:
@@ -156,27 +354,32 @@ class WatchService:
                     if not batch:
                         continue
                     missing_total += len(batch)
-                    for p in batch:
-                        self.indexer.enqueue(p)
+                    self.indexer.enqueue_many(batch)
                     self._emit_queue_status()
                 if missing_total:
-                    self._emit_status(f"Queueing content index for {missing_total} files…")
+                    self._emit_status(f"Queueing content index for {missing_total} files…", force=True)
         except Exception:
             pass
 
-        # Start observers
+        # Imported here rather than at module top: watchdog.observers pulls
+        # in the platform backend (inotify/fsevents), which callers that
+        # never start a watcher shouldn't pay for at import time.
+        from watchdog.observers import Observer
+
+        # One Observer watching every root: a single emitter thread and
+        # inotify descriptor instead of one per root.
         handler = _Handler(self.repo, self.cfg.roots, self.indexer)
+        ob = Observer()
         for root in self.cfg.roots:
-            ob = Observer()
             ob.schedule(handler, str(root), recursive=True)
-            ob.daemon = True
-            ob.start()
-            self._observers.append(ob)
-        self._emit_status("Watching for changes…")
+        ob.daemon = True
+        ob.start()
+        self._observer = ob
+        self._emit_status("Watching for changes…", force=True)
 
-        # Wait loop
-        while not self._stop_event.is_set():
-            time.sleep(0.5)
+        # Block until stop() — no polling wakeups, and shutdown is
+        # immediate instead of up to half a second late.
+        self._stop_event.wait()
 
     def start_in_thread(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -186,13 +389,13 @@ class WatchService:
 
     def stop(self) -> None:
         self._stop_event.set()
-        for ob in self._observers:
+        if self._observer is not None:
             try:
-                ob.stop()
-                ob.join(timeout=2.0)
+                self._observer.stop()
+                self._observer.join(timeout=2.0)
             except Exception:
                 pass
-        self._observers.clear()
+            self._observer = None
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5.0)
         self._thread = None
@@ -200,11 +403,109 @@ class WatchService:
         self._last_queue_depth = -1
 
 
-def os_walk_filtered(root: Path, exclude_dir_names: Set[str]):
-    # A generator similar to os.walk but filters excluded dirnames in-place
-    from os import walk
-    for dirpath, dirnames, filenames in walk(root):
-        # Filter exclude dirs by name (case-insensitive)
-        dirnames[:] = [d for d in dirnames if d.lower() not in exclude_dir_names]
-        yield dirpath, dirnames, filenames
+def _lower_thread_priority() -> None:
+    # Let the GUI and search queries preempt the background crawl. Only
+    # Linux treats setpriority(PRIO_PROCESS, 0) as per-thread; on macOS the
+    # same call would renice the whole process — GUI included — so Darwin
+    # uses PRIO_DARWIN_THREAD where available and otherwise stays at normal
+    # priority. Threads spawned afterwards (the scan writer) inherit the
+    # niceness, and setting the absolute value keeps repeated calls
+    # idempotent, unlike os.nice deltas.
+    try:
+        if sys.platform == "linux":
+            os.setpriority(os.PRIO_PROCESS, 0, 19)
+        elif sys.platform == "darwin" and hasattr(os, "PRIO_DARWIN_THREAD"):  # pragma: no cover
+            os.setpriority(os.PRIO_DARWIN_THREAD, 0, os.PRIO_DARWIN_BG)
+        elif os.name == "nt":  # pragma: no cover - Windows only
+            import ctypes
+
+            THREAD_PRIORITY_LOWEST = -2
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_LOWEST)
+    except Exception:
+        pass
+
+
+def _scandir_walk(
+    root: str,
+    excludes_cf: frozenset,
+    exclude_prefixes: tuple = (),
+    exclude_re: "re.Pattern | None" = None,
+    dir_mtimes: dict | None = None,
+    dir_updates: list | None = None,
+    _mtime_ns: int | None = None,
+):
+    # Recursive scandir: yields (DirEntry, stat_result) pairs, so callers
+    # get entry.path and the stat without re-statting — os.walk stats every
+    # entry itself and then threw that result away. On POSIX each file is
+    # stat'd relative to an open directory fd (os.fwalk's trick), which
+    # resolves one path component in the kernel instead of the whole path.
+    # *excludes_cf* must already be case-folded (WatcherConfig.excludes_cf).
+    #
+    # When *dir_mtimes* is given (cached {path: mtime_ns} from a previous
+    # completed scan), directories whose mtime is unchanged skip yielding
+    # their files — same mtime means the same direct entries. Subdirectories
+    # are still descended, since directory mtimes do not propagate upward.
+    # Directories scanned to completion are appended to *dir_updates* for
+    # the caller to persist.
+    prune = dir_mtimes is not None
+    if prune and _mtime_ns is None:
+        try:
+            _mtime_ns = os.stat(root).st_mtime_ns
+        except OSError:
+            prune = False
+    unchanged = prune and dir_mtimes.get(root) == _mtime_ns
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    dir_fd = -1
+    if _HAS_DIR_FD and not unchanged:
+        try:
+            dir_fd = os.open(root, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        except OSError:
+            dir_fd = -1
+    try:
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    name_cf = entry.name.casefold()
+                    if name_cf in excludes_cf:
+                        continue
+                    if exclude_re is not None and exclude_re.match(name_cf):
+                        continue
+                    if exclude_prefixes and (entry.path.casefold() + os.sep).startswith(exclude_prefixes):
+                        continue
+                    sub_mtime = None
+                    if prune:
+                        try:
+                            sub_mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                        except OSError:
+                            pass
+                    yield from _scandir_walk(
+                        entry.path, excludes_cf, exclude_prefixes, exclude_re, dir_mtimes, dir_updates, sub_mtime
+                    )
+                elif not unchanged:
+                    try:
+                        if dir_fd >= 0:
+                            st = os.stat(entry.name, dir_fd=dir_fd)
+                        else:
+                            st = entry.stat()
+                    except OSError:
+                        continue
+                    # The stat above follows symlinks, so a link to a
+                    # directory lands here with a directory stat; only
+                    # regular files belong in docs (mirrors _index_batch).
+                    if not stat_module.S_ISREG(st.st_mode):
+                        continue
+                    yield entry, st
+    finally:
+        if dir_fd >= 0:
+            os.close(dir_fd)
+    if prune and not unchanged and dir_updates is not None:
+        dir_updates.append((root, _mtime_ns))
 
@@ -5,7 +5,7 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from fastsearch.index.db import initialize
+from fastsearch.index.db import get_connection, initialize
 from fastsearch.index.docs_repo import DocsRepo, SearchFilters
 
 
@@ -41,6 +41,21 @@ class DocsRepoTestCase(unittest.TestCase):
         self.assertIn("filetype", facets)
         self.assertIn("Document", facets["filetype"])
 
+    def test_search_filter_queries_use_indexes(self) -> None:
+        self._create_file("docs/report.txt", "quarterly report")
+        con = get_connection(self.db_path)
+
+        queries = {
+            "browse": "SELECT id FROM docs WHERE deleted=0 ORDER BY mtime_ns DESC LIMIT 50",
+            "filetype": "SELECT id FROM docs WHERE deleted=0 AND filetype IN ('Document') ORDER BY mtime_ns DESC LIMIT 50",
+            "location": "SELECT id FROM docs WHERE deleted=0 AND location_id IN (1) ORDER BY mtime_ns DESC LIMIT 50",
+        }
+        for name, sql in queries.items():
+            plan = " | ".join(
+                row[-1] for row in con.execute("EXPLAIN QUERY PLAN " + sql)
+            )
+            self.assertIn("USING INDEX", plan, f"{name}: {plan}")
+
     def test_iter_paths_missing_content_batches(self) -> None:
         files = [
             self._create_file(f"docs/file_{i}.txt", f"payload {i}")
@@ -53,6 +68,28 @@ class DocsRepoTestCase(unittest.TestCase):
         self.assertGreater(len(batches), 1)  # ensured batching
         self.assertEqual({path.resolve() for path in flattened}, {f.resolve() for f in files})
 
+    def test_upsert_succeeds_after_rolled_back_location_insert(self) -> None:
+        # A rolled-back caller-owned transaction discards the location row
+        # that ensure_location memoized; after invalidate_location_cache a
+        # retry must re-resolve the id instead of raising IntegrityError.
+        path = self.root / "docs" / "report.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("sample", encoding="utf-8")
+        con = get_connection(self.db_path)
+
+        con.execute("BEGIN IMMEDIATE")
+        self.repo.upsert_files_bulk(con, [path], [self.root])
+        con.rollback()
+        self.repo.invalidate_location_cache()
+
+        doc_id = self.repo.upsert_file(path, [self.root])
+        self.assertIsNotNone(doc_id)
+        row = con.execute(
+            "SELECT locations.path FROM docs JOIN locations ON locations.id = docs.location_id WHERE docs.id=?",
+            (doc_id,),
+        ).fetchone()
+        self.assertEqual(Path(row[0]), self.root)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -15,8 +15,8 @@ class DummyRepo:
     def location_ids_for_paths(self, paths):
         return []
 
-    def search(self, query, filters: SearchFilters, limit: int = 500, mode: str = "all"):
-        return [], {"filetype": {}, "size_bucket": {}, "date_bucket": {}, "location": {}}
+    def search(self, query, filters: SearchFilters, limit: int = 500, mode: str = "all", **kwargs):
+        return {}, {"filetype": {}, "size_bucket": {}, "date_bucket": {}, "location": {}}
 
 
 class DummyWatcher:
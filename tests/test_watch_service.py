@@ -28,6 +28,9 @@ class DummyIndexer:
     def enqueue(self, path: Path) -> None:
         self.enqueued.append(Path(path))
 
+    def enqueue_many(self, paths) -> None:
+        self.enqueued.extend(Path(p) for p in paths)
+
     def queue_size(self) -> int:
         return len(self.enqueued)
 